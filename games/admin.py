@@ -1,5 +1,177 @@
 from django.contrib import admin
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max
+from django.utils.functional import cached_property
+from django.utils.html import format_html, format_html_join
+
 from games.models import Game, Move
+from games.sharding import ID_OFFSET_BITS, get_shards, is_sharded
+
+
+def estimate_row_count(queryset):
+    """
+    Returns an estimate of the number of rows in the queryset's table without
+    scanning it, or None if there's no cheap way to get one. Uses the planner
+    statistics on PostgreSQL and the largest primary key everywhere else, which
+    overestimates once rows have been deleted.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE relname = %s",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] > 0 else None
+
+    # MAX on the primary key is a single index lookup
+    rows = queryset.model._default_manager.using(queryset.db)
+    max_pk = rows.aggregate(max_pk=Max("pk"))["max_pk"]
+    if not max_pk or max_pk >> ID_OFFSET_BITS == 0:
+        return max_pk
+
+    # Every shard hands out ids from its own range (see migrate_shards), and
+    # games moved between shards keep theirs, so the largest id of each range
+    # is counted from the start of the range
+    estimate = 0
+    for start in range(0, max_pk + 1, 1 << ID_OFFSET_BITS):
+        range_max_pk = rows.filter(
+            pk__gte=start, pk__lt=start + (1 << ID_OFFSET_BITS)
+        ).aggregate(max_pk=Max("pk"))["max_pk"]
+        if range_max_pk:
+            estimate += range_max_pk - start
+    return estimate
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that estimates the number of rows of unfiltered change lists
+    instead of counting the whole table.
+    """
+
+    @cached_property
+    def count(self):
+        if not self.object_list.query.where:
+            estimate = estimate_row_count(self.object_list)
+            if estimate is not None:
+                return estimate
+        return super().count
+
+
+def board_preview(board):
+    """
+    Renders a board as a small monospaced grid.
+    """
+    if not board:
+        return "-"
+    return format_html(
+        '<span style="font-family: monospace; white-space: pre">{}</span>',
+        format_html_join(
+            format_html("<br>"), "{}", ((" ".join(row),) for row in board)
+        ),
+    )
+
+
+class ShardListFilter(admin.SimpleListFilter):
+    """
+    Picks the shard a change list reads from, since a queryset can only read
+    from one database. Defaults to the first shard.
+    """
+
+    title = "shard"
+    parameter_name = "shard"
+
+    def lookups(self, request, model_admin):
+        return [(shard, shard) for shard in get_shards()]
+
+    def queryset(self, request, queryset):
+        return queryset.using(self.value() or get_shards()[0])
+
+
+class ShardedModelAdmin(admin.ModelAdmin):
+    """
+    ModelAdmin for models stored in the game shards. Related objects that live
+    in another database are prefetched instead of joined.
+    """
+
+    shard_prefetch_related = []
+
+    def get_list_filter(self, request):
+        list_filter = super().get_list_filter(request)
+        if is_sharded():
+            return [ShardListFilter, *list_filter]
+        return list_filter
+
+    def get_list_select_related(self, request):
+        if is_sharded():
+            # False would make the change list join every related field
+            return []
+        return super().get_list_select_related(request)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if is_sharded():
+            queryset = queryset.prefetch_related(*self.shard_prefetch_related)
+        return queryset
+
+    def get_object(self, request, object_id, from_field=None):
+        if not is_sharded():
+            return super().get_object(request, object_id, from_field)
+
+        queryset = self.get_queryset(request)
+        model = queryset.model
+        field = (
+            model._meta.pk if from_field is None else model._meta.get_field(from_field)
+        )
+        try:
+            object_id = field.to_python(object_id)
+        except (ValidationError, ValueError):
+            return None
+        for shard in get_shards():
+            obj = queryset.using(shard).filter(**{field.name: object_id}).first()
+            if obj is not None:
+                return obj
+        return None
+
+
+@admin.register(Game)
+class GameAdmin(ShardedModelAdmin):
+    list_display = ["id", "player", "game_winner", "created_at", "board"]
+    list_filter = ["game_winner", "created_at"]
+    list_select_related = ["player"]
+    shard_prefetch_related = ["player"]
+    raw_id_fields = ["player"]
+    ordering = ["-id"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name.endswith(
+            "changelist"
+        ):
+            # Reads the board of each row in the same query
+            queryset = queryset.with_current_board()
+        return queryset
+
+    @admin.display(description="Board")
+    def board(self, obj):
+        return board_preview(getattr(obj, "current_board", None))
+
+
+@admin.register(Move)
+class MoveAdmin(ShardedModelAdmin):
+    list_display = ["id", "game", "ply", "move_by", "created_at", "board"]
+    list_select_related = ["game__player"]
+    shard_prefetch_related = ["game__player"]
+    raw_id_fields = ["game"]
+    ordering = ["-id"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
-admin.site.register(Game, admin.ModelAdmin)
-admin.site.register(Move, admin.ModelAdmin)
+    @admin.display(description="Board")
+    def board(self, obj):
+        return board_preview(obj.board_state)
@@ -0,0 +1,91 @@
+from functools import lru_cache
+
+# Value of each token in the base 3 encoding of a board. Tokens match the ones
+# used by GameLogicService: '.' for empty spaces, 'X' for the player and 'O' for the computer.
+TOKEN_VALUES = {".": 0, "X": 1, "O": 2}
+VALUE_TOKENS = {value: token for token, value in TOKEN_VALUES.items()}
+
+# Number of distinct board encodings, every key is in the range [0, BOARD_KEYS)
+BOARD_KEYS = 3**9
+
+# The 8 symmetries of the board (4 rotations and their mirror images). Each one is
+# a function that maps a (row, column) position to its position once transformed.
+SYMMETRIES = [
+    lambda i, j: (i, j),
+    lambda i, j: (j, 2 - i),
+    lambda i, j: (2 - i, 2 - j),
+    lambda i, j: (2 - j, i),
+    lambda i, j: (i, 2 - j),
+    lambda i, j: (2 - i, j),
+    lambda i, j: (j, i),
+    lambda i, j: (2 - j, 2 - i),
+]
+
+# For each symmetry, the index in the flattened board that every cell moves to
+SYMMETRY_PERMUTATIONS = [
+    [3 * x + y for (x, y) in (symmetry(i, j) for i in range(3) for j in range(3))]
+    for symmetry in SYMMETRIES
+]
+
+
+def encode_board(board):
+    """
+    Encodes a 3 x 3 board as an integer, reading the board row by row as the
+    digits of a base 3 number where the first cell is the least significant digit.
+    Raises ValueError if the board contains an unknown token.
+    """
+    key = 0
+    for row in reversed(board):
+        for token in reversed(row):
+            if token not in TOKEN_VALUES:
+                raise ValueError(f"Unknown board token: {token}")
+            key = key * 3 + TOKEN_VALUES[token]
+    return key
+
+
+def decode_board(key):
+    """
+    Returns the 3 x 3 board represented by the given key.
+    """
+    cells = []
+    for _ in range(9):
+        key, value = divmod(key, 3)
+        cells.append(VALUE_TOKENS[value])
+    return [cells[0:3], cells[3:6], cells[6:9]]
+
+
+@lru_cache(maxsize=BOARD_KEYS)
+def get_canonical_key(key):
+    """
+    Returns the canonical key for the position represented by the given board key,
+    i.e the smallest key among the 8 symmetries of the board. Boards that are
+    rotations or mirror images of each other share the same canonical key.
+    """
+    digits = []
+    for _ in range(9):
+        key, value = divmod(key, 3)
+        digits.append(value)
+
+    canonical_key = None
+    for permutation in SYMMETRY_PERMUTATIONS:
+        transformed = [0] * 9
+        for index, target in enumerate(permutation):
+            transformed[target] = digits[index]
+        candidate = 0
+        for value in reversed(transformed):
+            candidate = candidate * 3 + value
+        if canonical_key is None or candidate < canonical_key:
+            canonical_key = candidate
+
+    return canonical_key
+
+
+def get_position_key(board):
+    """
+    Returns the canonical key of the given board, which is what Move.position_key stores.
+    Returns None for boards that can't be encoded.
+    """
+    try:
+        return get_canonical_key(encode_board(board))
+    except ValueError:
+        return None
@@ -0,0 +1,67 @@
+import numpy as np
+
+from games.boards import BOARD_KEYS
+from games.constants import PLAYER, COMPUTER, TIE
+from games.services import GameLogicService
+
+# Results returned by evaluate_boards
+IN_PROGRESS = 0
+PLAYER_WON = 1
+COMPUTER_WON = 2
+TIED = 3
+
+# Game.game_winner value for each result, indexed by result code
+RESULT_WINNERS = np.array([None, PLAYER, COMPUTER, TIE], dtype=object)
+
+# Value of each cell in a board key, see games.boards.encode_board
+CELL_POWERS = 3 ** np.arange(9, dtype=np.int64)
+
+# Winning combinations as indexes into the flattened board
+LINES = np.array(
+    [[3 * i + j for (i, j) in combo] for combo in GameLogicService.WINNING_COMBOS]
+)
+
+
+def decode_boards(keys):
+    """
+    Decodes an array of board keys into an (n, 9) array of cell values, where
+    0 is an empty space, 1 a player token and 2 a computer token.
+    """
+    keys = np.asarray(keys, dtype=np.int64)
+    if keys.size and (keys.min() < 0 or keys.max() >= BOARD_KEYS):
+        raise ValueError("Board keys must be in the range [0, 3^9)")
+    return ((keys[:, np.newaxis] // CELL_POWERS) % 3).astype(np.int8)
+
+
+def evaluate_cells(cells):
+    """
+    Returns the result code of every board in an (n, 9) array of cell values.
+    Follows the same rules as GameLogicService.get_board_winner: the player is
+    checked first, then the computer, and a full board with no winner is a tie.
+    """
+    lines = cells[:, LINES]
+    player_won = (lines == 1).all(axis=2).any(axis=1)
+    computer_won = (lines == 2).all(axis=2).any(axis=1)
+    full = (cells != 0).all(axis=1)
+
+    results = np.full(len(cells), IN_PROGRESS, dtype=np.int8)
+    results[full] = TIED
+    results[computer_won] = COMPUTER_WON
+    results[player_won] = PLAYER_WON
+    return results
+
+
+def evaluate_boards(keys):
+    """
+    Returns the result code (IN_PROGRESS, PLAYER_WON, COMPUTER_WON or TIED) of
+    every board in an array of board keys. Canonical position keys can be given
+    too, since the result of a board doesn't change under its symmetries.
+    """
+    return evaluate_cells(decode_boards(keys))
+
+
+def get_winners(keys):
+    """
+    Returns an array with the expected Game.game_winner value for each board key.
+    """
+    return RESULT_WINNERS[evaluate_boards(keys)]
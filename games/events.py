@@ -0,0 +1,106 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+
+
+class GameEventBroker:
+    """
+    In-process publish/subscribe for game events. Each subscriber gets its own
+    asyncio queue, so an idle subscription costs one queue and a suspended
+    coroutine. Events can be published from any thread: they are handed to
+    the subscriber's event loop, which is where the queue is read.
+
+    Since the broker lives in memory, subscribers only receive events for the
+    moves made by the same process.
+    """
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, game_id):
+        """
+        Returns a new subscription to the events of the given game. Must be
+        called from the event loop that will read the subscription.
+        """
+        subscription = Subscription(game_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[game_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.game_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.game_id]
+
+    def publish(self, game_id, name, data):
+        """
+        Sends an event to every subscriber of the given game.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(game_id, ()))
+        for subscription in subscribers:
+            subscription.put(name, data)
+
+    def subscriber_count(self, game_id):
+        with self._lock:
+            return len(self._subscribers.get(game_id, ()))
+
+
+class Subscription:
+    def __init__(self, game_id, loop):
+        self.game_id = game_id
+        self.loop = loop
+        self.queue = asyncio.Queue()
+
+    def put(self, name, data):
+        try:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, (name, data))
+        except RuntimeError:
+            # The subscriber's loop was closed, there's no one left to notify
+            pass
+
+    async def get(self):
+        return await self.queue.get()
+
+
+broker = GameEventBroker()
+
+
+def format_event(name, data):
+    """
+    Formats an event using the Server-Sent Events wire format.
+    """
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+def publish_move(move, game_winner):
+    """
+    Publishes the given move, and the end of the game if there's a winner,
+    once the current transaction is committed.
+    """
+
+    def publish():
+        broker.publish(
+            move.game_id,
+            "move",
+            {
+                "ply": move.ply,
+                "x": move.x,
+                "y": move.y,
+                "move_by": move.move_by,
+                "board": move.board_state,
+                "game_winner": game_winner,
+            },
+        )
+        if game_winner:
+            broker.publish(move.game_id, "game_over", {"game_winner": game_winner})
+
+    transaction.on_commit(publish)
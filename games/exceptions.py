@@ -1,6 +1,22 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
 class InvalidMove(Exception):
     pass
 
 
 class InvalidPlayer(Exception):
     pass
+
+
+class MoveOutOfOrder(Exception):
+    pass
+
+
+class MoveConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = (
+        "Another move was made on this game at the same time, reload it and try again."
+    )
+    default_code = "move_conflict"
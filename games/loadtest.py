@@ -0,0 +1,211 @@
+import asyncio
+import json
+import math
+import random
+import time
+from collections import defaultdict
+
+from games.constants import WINNER_CHOICES
+
+
+def percentile(values, q):
+    """
+    Returns the q-th percentile (0-100) of the sorted values, using the
+    nearest-rank method.
+    """
+    if not values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+class HTTPError(Exception):
+    def __init__(self, status, body):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.body = body
+
+
+class HTTPClient:
+    """
+    Minimal HTTP/1.1 client over a single keep-alive connection, enough to
+    talk JSON to the API without adding a dependency. Reconnects when the
+    server closes the connection.
+    """
+
+    def __init__(self, host, port, headers=None):
+        self.host = host
+        self.port = port
+        self.headers = {"Host": f"{host}:{port}", **(headers or {})}
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, data=None):
+        """
+        Sends a request and returns the status and the decoded JSON body.
+        """
+        body = b"" if data is None else json.dumps(data).encode()
+        headers = {**self.headers, "Content-Length": str(len(body))}
+        if data is not None:
+            headers["Content-Type"] = "application/json"
+        message = (
+            f"{method} {path} HTTP/1.1\r\n"
+            + "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+            + "\r\n"
+        ).encode() + body
+
+        for attempt in range(2):
+            reused = self.writer is not None
+            if not reused:
+                await self.connect()
+            try:
+                self.writer.write(message)
+                await self.writer.drain()
+                return await self.read_response()
+            except (asyncio.IncompleteReadError, ConnectionError):
+                await self.close()
+                # Only a connection the server closed while idle is retried
+                if not reused or attempt:
+                    raise
+
+    async def read_response(self):
+        status_line = await self.reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in headers:
+            body = await self.reader.readexactly(int(headers["content-length"]))
+            if headers.get("connection", "").lower() == "close":
+                await self.close()
+        else:
+            body = await self.reader.read()
+            await self.close()
+
+        if status >= 400:
+            raise HTTPError(status, body)
+        return status, json.loads(body) if body else None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+        self.reader = self.writer = None
+
+
+class LoadTest:
+    """
+    Drives the API with virtual users that play full games: each one creates
+    a game, posts moves on random empty spaces until the game is over, and
+    polls the game and its new moves after every move, like a client would.
+    Latencies are recorded per endpoint.
+    """
+
+    def __init__(self, host, port, prefix="/api/v1", polls=1, seed=None):
+        self.host = host
+        self.port = port
+        self.prefix = prefix
+        self.polls = polls
+        self.rng = random.Random(seed)
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.games = 0
+        self.elapsed = 0.0
+
+    def run(self, sessions, duration):
+        """
+        Runs one virtual user per session, given as a dict of extra request
+        headers, for the given number of seconds.
+        """
+        start = time.perf_counter()
+        asyncio.run(self.run_users(sessions, start + duration))
+        self.elapsed = time.perf_counter() - start
+
+    async def run_users(self, sessions, deadline):
+        await asyncio.gather(
+            *(self.run_user(headers, deadline) for headers in sessions)
+        )
+
+    async def run_user(self, headers, deadline):
+        client = HTTPClient(self.host, self.port, headers)
+        try:
+            while time.perf_counter() < deadline:
+                try:
+                    await self.play_game(client, deadline)
+                except HTTPError:
+                    # Already counted, the user starts a new game
+                    continue
+                except (OSError, asyncio.IncompleteReadError):
+                    await asyncio.sleep(0.1)
+        finally:
+            await client.close()
+
+    async def play_game(self, client, deadline):
+        _, game = await self.timed(client, "create", "POST", "/games/", {})
+        game_path = f"/games/{game['id']}/"
+        board = [[".", ".", "."], [".", ".", "."], [".", ".", "."]]
+        ply = 0
+        while time.perf_counter() < deadline:
+            x, y = self.rng.choice(
+                [(x, y) for x in range(3) for y in range(3) if board[x][y] == "."]
+            )
+            _, state = await self.timed(
+                client, "move", "POST", f"{game_path}move/", {"x": x, "y": y}
+            )
+            for _ in range(self.polls):
+                await self.timed(client, "retrieve", "GET", game_path)
+                await self.timed(
+                    client, "moves", "GET", f"{game_path}moves/?since={ply}"
+                )
+            board = state["board"]
+            ply += 2
+            if state["game_winner"] in WINNER_CHOICES:
+                self.games += 1
+                return
+
+    async def timed(self, client, endpoint, method, path, data=None):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, self.prefix + path, data)
+        except HTTPError as error:
+            self.errors[endpoint, error.status] += 1
+            raise
+        except (OSError, asyncio.IncompleteReadError):
+            self.errors[endpoint, "connection"] += 1
+            raise
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        return response
+
+    def get_report(self):
+        """
+        Returns the requests, errors, throughput and latency percentiles in
+        milliseconds of every endpoint.
+        """
+        report = {}
+        for endpoint in sorted(
+            {*self.latencies, *(endpoint for endpoint, _ in self.errors)}
+        ):
+            latencies = sorted(self.latencies[endpoint])
+            report[endpoint] = {
+                "requests": len(latencies),
+                "errors": sum(
+                    count
+                    for (name, _), count in self.errors.items()
+                    if name == endpoint
+                ),
+                "rps": len(latencies) / max(self.elapsed, 1e-9),
+                **{f"p{q}": percentile(latencies, q) * 1000 for q in (50, 95, 99)},
+                "max": (latencies[-1] * 1000) if latencies else 0.0,
+            }
+        return report
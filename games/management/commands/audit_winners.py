@@ -0,0 +1,152 @@
+import time
+from collections import Counter, defaultdict
+
+# Django imports
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+# Project imports
+from games.boards import get_position_key
+from games.evaluator import get_winners
+from games.models import Game, Move
+from games.sharding import get_shards
+
+
+class Command(BaseCommand):
+    help = (
+        "Checks Game.game_winner against the final stored move of every game, "
+        "evaluating the boards in vectorized batches. Use --repair to fix mismatches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Number of games checked per batch.",
+        )
+        parser.add_argument(
+            "--repair",
+            action="store_true",
+            help="Update game_winner for the games that don't match their final board.",
+        )
+
+    def handle(self, *args, **options):
+        self.checked = 0
+        self.unreadable = 0
+        self.mismatches = Counter()
+        start = time.perf_counter()
+
+        for shard in get_shards():
+            self.audit(shard, options["batch_size"], options["repair"])
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"Checked {self.checked} games in {elapsed:.2f}s ({self.checked / max(elapsed, 1e-9):,.0f} games/s)"
+        )
+        if self.unreadable:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{self.unreadable} games have a final board that can't be read"
+                )
+            )
+        for (stored, expected), count in sorted(self.mismatches.items(), key=str):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{count} games stored as {stored} should be {expected}"
+                )
+            )
+        if self.mismatches and options["repair"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"Repaired {sum(self.mismatches.values())} games")
+            )
+
+    def audit(self, shard, batch_size, repair):
+        """
+        Audits the games stored in the given database, in batches by primary key.
+        """
+        latest_moves = Move.objects.filter(game=OuterRef("pk")).order_by(
+            "-created_at", "-id"
+        )
+        games = (
+            Game.objects.using(shard)
+            .annotate(
+                final_move_id=Subquery(latest_moves.values("id")[:1]),
+                final_position_key=Subquery(latest_moves.values("position_key")[:1]),
+            )
+            .order_by("id")
+        )
+
+        last_id = 0
+        while True:
+            batch = list(
+                games.filter(id__gt=last_id).values_list(
+                    "id", "game_winner", "final_move_id", "final_position_key"
+                )[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+
+            expected_winners = self.get_expected_winners(shard, batch)
+            to_repair = defaultdict(list)
+            for game_id, game_winner, final_move_id, _ in batch:
+                if final_move_id is None:
+                    # Games without moves can't have a winner
+                    expected_winner = None
+                elif game_id not in expected_winners:
+                    self.unreadable += 1
+                    continue
+                else:
+                    expected_winner = expected_winners[game_id]
+
+                if game_winner != expected_winner:
+                    self.mismatches[(game_winner, expected_winner)] += 1
+                    to_repair[expected_winner].append(game_id)
+
+            if repair and to_repair:
+                with transaction.atomic(using=shard):
+                    for winner, ids in to_repair.items():
+                        Game.objects.using(shard).filter(id__in=ids).update(
+                            game_winner=winner
+                        )
+
+            self.checked += len(batch)
+            self.stdout.write(
+                f"Checked {self.checked} games, {sum(self.mismatches.values())} mismatches"
+            )
+
+    def get_expected_winners(self, shard, batch):
+        """
+        Returns the expected winner for each game in the batch that has moves,
+        evaluated from the position key of its final move. Final moves without a
+        position key have their board read and encoded instead.
+        """
+        position_keys = {
+            game_id: position_key
+            for game_id, _, final_move_id, position_key in batch
+            if final_move_id is not None
+        }
+
+        missing = {
+            final_move_id: game_id
+            for game_id, _, final_move_id, position_key in batch
+            if final_move_id is not None and position_key is None
+        }
+        if missing:
+            boards = (
+                Move.objects.using(shard)
+                .filter(id__in=list(missing))
+                .values_list("id", "board_state")
+            )
+            for move_id, board_state in boards:
+                position_keys[missing[move_id]] = get_position_key(board_state)
+
+        readable = [
+            (game_id, key) for game_id, key in position_keys.items() if key is not None
+        ]
+        if not readable:
+            return {}
+        game_ids, keys = zip(*readable)
+        return dict(zip(game_ids, get_winners(keys)))
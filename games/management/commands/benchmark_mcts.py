@@ -0,0 +1,92 @@
+import random
+import time
+from collections import Counter
+
+# Django imports
+from django.core.management.base import BaseCommand
+
+# Project imports
+from games.constants import PLAYER, COMPUTER, TIE
+from games.mcts import MonteCarloTreeSearch
+from games.services import GameLogicService
+
+
+class Command(BaseCommand):
+    help = (
+        "Plays the Monte Carlo tree search opponent against a random player with "
+        "different playout budgets, and reports the playouts per second, the CPU "
+        "time per move and the results for each budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--playouts",
+            type=int,
+            nargs="+",
+            default=[64, 512, 2048, 8192],
+            help="Playout budgets to compare.",
+        )
+        parser.add_argument(
+            "--time-limit",
+            type=float,
+            default=None,
+            help="Time limit per move in seconds, applied on top of the playout budget.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=64,
+            help="Number of vectorized playouts per search iteration.",
+        )
+        parser.add_argument(
+            "--games", type=int, default=50, help="Games played for each budget."
+        )
+        parser.add_argument(
+            "--seed", type=int, default=None, help="Seed for the random generators."
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'playouts':>9} {'playouts/s':>12} {'ms/move':>9} "
+            f"{'won':>6} {'tied':>6} {'lost':>6}"
+        )
+        for playouts in options["playouts"]:
+            search = MonteCarloTreeSearch(
+                playouts=playouts,
+                time_limit=options["time_limit"],
+                batch_size=options["batch_size"],
+                seed=options["seed"],
+            )
+            rng = random.Random(options["seed"])
+
+            results = Counter()
+            moves = 0
+            total_playouts = 0
+            cpu_time = 0.0
+            wall_time = 0.0
+            for _ in range(options["games"]):
+                board = GameLogicService.get_initial_board()
+                player = PLAYER
+                winner = None
+                while not winner:
+                    if player == PLAYER:
+                        x, y = rng.choice(GameLogicService.get_empty_spaces(board))
+                    else:
+                        start = time.process_time()
+                        x, y = search.choose_move(board, COMPUTER)
+                        cpu_time += time.process_time() - start
+                        wall_time += search.elapsed
+                        total_playouts += search.playouts_run
+                        moves += 1
+                    board[x][y] = GameLogicService.get_player_token(player)
+                    winner = GameLogicService.get_board_winner(board)
+                    player = COMPUTER if player == PLAYER else PLAYER
+                results[winner] += 1
+
+            games = options["games"]
+            self.stdout.write(
+                f"{playouts:>9} {total_playouts / max(wall_time, 1e-9):>12,.0f} "
+                f"{cpu_time * 1000 / max(moves, 1):>9.2f} "
+                f"{results[COMPUTER] / games:>6.0%} {results[TIE] / games:>6.0%} "
+                f"{results[PLAYER] / games:>6.0%}"
+            )
@@ -0,0 +1,137 @@
+import random
+import statistics
+import time
+from contextlib import ExitStack
+
+# Django imports
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework.renderers import JSONRenderer
+
+# Project imports
+from games.management.commands.generate_load_data import simulate_game
+from games.models import Game, Move
+from games import renderers
+from games.renderers import FastJSONRenderer
+from games.serializers import FastRetrieveGameSerializer, RetrieveGameSerializer
+from games.sharding import get_shard_for_user, get_shards
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the CPU time spent serializing and rendering game lists with "
+        "RetrieveGameSerializer and JSONRenderer against the fast path used by the "
+        "games endpoints, timing each step separately. Benchmark data is created "
+        "in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[1, 100, 10000],
+            help="Number of games in each benchmarked list.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of times each list is serialized.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with ExitStack() as stack:
+                for alias in {DEFAULT_DB_ALIAS, *get_shards()}:
+                    stack.enter_context(transaction.atomic(using=alias))
+                self.run_benchmarks(options["sizes"], options["repeat"])
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def run_benchmarks(self, sizes, repeat):
+        rng = random.Random(0)
+        user = get_user_model().objects.create(username=f"benchmark-{time.time_ns()}")
+        self.shard = get_shard_for_user(user.id)
+        games = (
+            Game.objects.using(self.shard).filter(player=user).order_by("created_at")
+        )
+
+        if renderers.orjson is None:
+            self.stdout.write(
+                self.style.WARNING(
+                    "orjson isn't installed, FastJSONRenderer uses JSONRenderer"
+                )
+            )
+        self.stdout.write(
+            f"{'':>8} {'serialize (ms)':>21} {'render (ms)':>21}\n"
+            f"{'games':>8} {'default':>10} {'fast':>10} {'default':>10} {'fast':>10} "
+            f"{'speedup':>9}"
+        )
+        created = 0
+        for size in sorted(sizes):
+            self.create_games(user, size - created, rng)
+            created = size
+
+            default_serialize, default_data = self.measure(
+                repeat, lambda: RetrieveGameSerializer(games.all(), many=True).data
+            )
+            fast_serialize, fast_data = self.measure(
+                repeat,
+                lambda: FastRetrieveGameSerializer(
+                    games.with_current_board(), many=True
+                ).data,
+            )
+            default_render, default_payload = self.measure(
+                repeat, lambda: JSONRenderer().render(default_data)
+            )
+            fast_render, fast_payload = self.measure(
+                repeat, lambda: FastJSONRenderer().render(fast_data)
+            )
+            if default_payload != fast_payload:
+                raise CommandError(f"Payloads for {size} games are not identical")
+
+            default = default_serialize + default_render
+            fast = fast_serialize + fast_render
+            self.stdout.write(
+                f"{size:>8} {default_serialize * 1000:>10.2f} "
+                f"{fast_serialize * 1000:>10.2f} {default_render * 1000:>10.2f} "
+                f"{fast_render * 1000:>10.2f} {default / max(fast, 1e-9):>8.1f}x"
+            )
+
+    def create_games(self, user, count, rng):
+        histories = [simulate_game(rng, abandon_rate=0.5) for _ in range(count)]
+        games = Game.objects.using(self.shard).bulk_create(
+            [Game(player=user, game_winner=winner) for _, winner in histories]
+        )
+        Move.objects.using(self.shard).bulk_create(
+            [
+                Move(
+                    game=game,
+                    move_by=move_by,
+                    board_state=board_state,
+                    ply=ply,
+                    x=x,
+                    y=y,
+                )
+                for game, (moves, _) in zip(games, histories)
+                for ply, (move_by, x, y, board_state) in enumerate(moves, start=1)
+            ]
+        )
+
+    def measure(self, repeat, step):
+        """
+        Returns the median CPU time of the step and its result.
+        """
+        timings = []
+        for _ in range(repeat):
+            start = time.process_time()
+            result = step()
+            timings.append(time.process_time() - start)
+        return statistics.median(timings), result
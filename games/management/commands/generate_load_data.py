@@ -0,0 +1,184 @@
+import random
+import time
+from collections import defaultdict
+
+# Django imports
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+# Project imports
+from games.boards import get_position_key
+from games.constants import PLAYER, COMPUTER
+from games.models import Game, Move
+from games.services import GameLogicService
+from games.sharding import get_shard_for_user
+
+
+def simulate_game(rng, abandon_rate):
+    """
+    Plays a game between two random movers following the GameLogicService rules.
+    Returns a list of (move_by, x, y, board_state) tuples and the game winner, if any.
+    A fraction of the games given by abandon_rate are cut short at a random ply
+    to mimic players that never finish their games.
+    """
+    board = GameLogicService.get_initial_board()
+    moves = []
+    winner = None
+    player = PLAYER
+
+    while not winner:
+        x, y = rng.choice(GameLogicService.get_empty_spaces(board))
+        board = [row[:] for row in board]
+        board[x][y] = GameLogicService.get_player_token(player)
+        moves.append((player, x, y, board))
+        winner = GameLogicService.get_board_winner(board)
+        player = COMPUTER if player == PLAYER else PLAYER
+
+    if rng.random() < abandon_rate:
+        # Abandoned games stop anywhere between no moves and the move before the last
+        return moves[: rng.randrange(len(moves))], None
+
+    return moves, winner
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates synthetic users, games and moves for load testing. Boards are "
+        "produced with the real game rules and written with batched bulk inserts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users", type=int, default=1000, help="Number of users to create."
+        )
+        parser.add_argument(
+            "--games-per-user",
+            type=float,
+            default=20,
+            help="Average number of games per user. Games are exponentially distributed across users.",
+        )
+        parser.add_argument(
+            "--abandon-rate",
+            type=float,
+            default=0.15,
+            help="Fraction of games that are left unfinished.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of rows per bulk_create statement.",
+        )
+        parser.add_argument(
+            "--users-per-transaction",
+            type=int,
+            default=1000,
+            help="Number of users (with their games and moves) written per transaction.",
+        )
+        parser.add_argument(
+            "--username-prefix",
+            default="loadtest-",
+            help="Prefix for the generated usernames.",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=None, help="Seed for the random generator."
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        prefix = options["username_prefix"]
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(
+                f"There are already users with the prefix '{prefix}', use --username-prefix to pick another one."
+            )
+
+        rng = random.Random(options["seed"])
+        # Hashing a password per user would dominate the run time, so every
+        # generated user shares the same unusable password
+        password = make_password(None)
+        counts = {"users": 0, "games": 0, "moves": 0}
+        start = time.perf_counter()
+
+        total_users = options["users"]
+        chunk_size = options["users_per_transaction"]
+        for chunk_start in range(0, total_users, chunk_size):
+            chunk_end = min(chunk_start + chunk_size, total_users)
+            with transaction.atomic():
+                self.write_chunk(
+                    User,
+                    [f"{prefix}{i}" for i in range(chunk_start, chunk_end)],
+                    password,
+                    rng,
+                    options,
+                    counts,
+                )
+
+            elapsed = time.perf_counter() - start
+            rows = sum(counts.values())
+            self.stdout.write(
+                f"{counts['users']} users, {counts['games']} games, {counts['moves']} moves "
+                f"({rows / elapsed:,.0f} rows/s)"
+            )
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f"Done in {elapsed:.2f}s"))
+        for name, count in counts.items():
+            self.stdout.write(f"  {name}: {count} rows, {count / elapsed:,.0f} rows/s")
+
+    def write_chunk(self, User, usernames, password, rng, options, counts):
+        """
+        Creates the given users along with their games and moves.
+        """
+        batch_size = options["batch_size"]
+        users = User.objects.bulk_create(
+            [User(username=username, password=password) for username in usernames],
+            batch_size=batch_size,
+        )
+        counts["users"] += len(users)
+
+        games_by_shard = defaultdict(list)
+        mean_games = options["games_per_user"]
+        for user in users:
+            game_count = round(rng.expovariate(1 / mean_games)) if mean_games else 0
+            for _ in range(game_count):
+                moves, winner = simulate_game(rng, options["abandon_rate"])
+                games_by_shard[get_shard_for_user(user.id)].append(
+                    (Game(player_id=user.id, game_winner=winner), moves)
+                )
+
+        for shard, games in games_by_shard.items():
+            with transaction.atomic(using=shard):
+                self.write_games(shard, games, batch_size, counts)
+
+    def write_games(self, shard, games, batch_size, counts):
+        """
+        Creates the given games, a list of (game, history) tuples, and their moves.
+        """
+        Game.objects.using(shard).bulk_create(
+            [game for game, _ in games], batch_size=batch_size
+        )
+        counts["games"] += len(games)
+
+        moves = []
+        for game, history in games:
+            for ply, (move_by, x, y, board_state) in enumerate(history, start=1):
+                moves.append(
+                    Move(
+                        game_id=game.id,
+                        move_by=move_by,
+                        board_state=board_state,
+                        position_key=get_position_key(board_state),
+                        ply=ply,
+                        x=x,
+                        y=y,
+                    )
+                )
+            if len(moves) >= batch_size:
+                Move.objects.using(shard).bulk_create(moves, batch_size=batch_size)
+                counts["moves"] += len(moves)
+                moves = []
+
+        Move.objects.using(shard).bulk_create(moves, batch_size=batch_size)
+        counts["moves"] += len(moves)
@@ -0,0 +1,193 @@
+import socket
+import subprocess
+import sys
+import time
+
+# Django imports
+from django.conf import settings
+from django.contrib.auth import (
+    BACKEND_SESSION_KEY,
+    HASH_SESSION_KEY,
+    SESSION_KEY,
+    get_user_model,
+)
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+from django.middleware.csrf import CSRF_ALLOWED_CHARS, CSRF_SECRET_LENGTH
+from django.utils.crypto import get_random_string
+
+# Project imports
+from games.loadtest import LoadTest
+
+LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load tests the API on this machine with concurrent virtual users that "
+        "create games, make moves and poll their games, and reports the throughput "
+        "and the p50/p95/p99 latencies of every endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users", type=int, default=50, help="Number of concurrent virtual users."
+        )
+        parser.add_argument(
+            "--duration", type=float, default=30, help="Seconds to run the test for."
+        )
+        parser.add_argument(
+            "--polls",
+            type=int,
+            default=1,
+            help="Times each user polls the game and its moves after every move.",
+        )
+        parser.add_argument(
+            "--host", default="127.0.0.1", help="Host of the server, must be local."
+        )
+        parser.add_argument(
+            "--port", type=int, default=8765, help="Port of the server."
+        )
+        parser.add_argument(
+            "--launch",
+            action="store_true",
+            help="Start a development server on the port for the duration of the test.",
+        )
+        parser.add_argument(
+            "--username-prefix",
+            default="vu-",
+            help="Prefix of the usernames of the virtual users, created if missing.",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=None, help="Seed for the random moves."
+        )
+
+    def handle(self, *args, **options):
+        if options["host"] not in LOCAL_HOSTS:
+            raise CommandError("The load test only runs against a local server")
+
+        users = self.get_users(options["users"], options["username_prefix"])
+        sessions = [self.create_session(user) for user in users]
+        server = None
+        try:
+            if options["launch"]:
+                server = self.launch_server(options["host"], options["port"])
+            load_test = LoadTest(
+                options["host"],
+                options["port"],
+                polls=options["polls"],
+                seed=options["seed"],
+            )
+            self.stdout.write(
+                f"Running {len(users)} virtual users for {options['duration']}s"
+            )
+            load_test.run(
+                [self.get_headers(session) for session in sessions],
+                options["duration"],
+            )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+            for session in sessions:
+                session.delete()
+
+        self.report(load_test)
+
+    def get_users(self, count, prefix):
+        """
+        Returns the virtual users, creating the missing ones without a usable
+        password since they authenticate with sessions.
+        """
+        User = get_user_model()
+        usernames = [f"{prefix}{i}" for i in range(count)]
+        existing = set(
+            User.objects.filter(username__in=usernames).values_list(
+                "username", flat=True
+            )
+        )
+        missing = []
+        for username in usernames:
+            if username not in existing:
+                user = User(username=username)
+                user.set_unusable_password()
+                missing.append(user)
+        User.objects.bulk_create(missing)
+        return list(User.objects.filter(username__in=usernames))
+
+    def create_session(self, user):
+        """
+        Logs the user in by storing a session directly, which skips hashing
+        a password for every virtual user.
+        """
+        session = SessionStore()
+        session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        return session
+
+    def get_headers(self, session):
+        # Session authentication checks the CSRF token of unsafe requests
+        csrf_token = get_random_string(CSRF_SECRET_LENGTH, CSRF_ALLOWED_CHARS)
+        return {
+            "Cookie": (
+                f"{settings.SESSION_COOKIE_NAME}={session.session_key}; "
+                f"{settings.CSRF_COOKIE_NAME}={csrf_token}"
+            ),
+            "X-CSRFToken": csrf_token,
+        }
+
+    def launch_server(self, host, port, timeout=30):
+        """
+        Starts the development server and waits until it accepts connections.
+        """
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                str(settings.BASE_DIR / "manage.py"),
+                "runserver",
+                "--noreload",
+                f"{host}:{port}" if host != "::1" else f"[{host}]:{port}",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"The server exited with code {server.returncode}")
+            try:
+                socket.create_connection((host, port), timeout=1).close()
+                return server
+            except OSError:
+                time.sleep(0.1)
+        server.terminate()
+        raise CommandError(f"The server didn't start in {timeout}s")
+
+    def report(self, load_test):
+        report = load_test.get_report()
+        self.stdout.write(
+            f"{'endpoint':<10} {'requests':>9} {'errors':>7} {'req/s':>8} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+        )
+        for endpoint, stats in report.items():
+            self.stdout.write(
+                f"{endpoint:<10} {stats['requests']:>9} {stats['errors']:>7} "
+                f"{stats['rps']:>8.1f} {stats['p50']:>8.1f} {stats['p95']:>8.1f} "
+                f"{stats['p99']:>8.1f} {stats['max']:>8.1f}"
+            )
+
+        requests = sum(stats["requests"] for stats in report.values())
+        errors = sum(stats["errors"] for stats in report.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{requests} requests in {load_test.elapsed:.1f}s "
+                f"({requests / max(load_test.elapsed, 1e-9):,.1f} req/s), "
+                f"{errors} errors, {load_test.games} games finished"
+            )
+        )
+        for (endpoint, status), count in sorted(load_test.errors.items(), key=str):
+            self.stdout.write(
+                self.style.WARNING(f"{count} {endpoint} requests failed ({status})")
+            )
@@ -0,0 +1,62 @@
+# Django imports
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Project imports
+from games.models import Game, Move
+from games.sharding import get_id_offset, get_shards, is_sharded
+
+
+class Command(BaseCommand):
+    help = (
+        "Migrates the default database and every game shard, and makes sure "
+        "the shards hand out non-overlapping game and move ids."
+    )
+
+    def handle(self, *args, **options):
+        for alias in dict.fromkeys([DEFAULT_DB_ALIAS, *get_shards()]):
+            self.stdout.write(f"Migrating {alias}")
+            call_command(
+                "migrate",
+                database=alias,
+                interactive=False,
+                verbosity=options["verbosity"],
+            )
+
+        if not is_sharded():
+            return
+        for shard in get_shards():
+            self.seed_ids(shard)
+
+    def seed_ids(self, shard):
+        """
+        Moves the SQLite AUTOINCREMENT sequences of the game tables of the
+        shard to its id range, unless they're already past its start.
+        """
+        connection = connections[shard]
+        if connection.vendor != "sqlite":
+            self.stdout.write(
+                self.style.WARNING(f"Skipping the ids of {shard}, it isn't SQLite")
+            )
+            return
+
+        offset = get_id_offset(shard)
+        with connection.cursor() as cursor:
+            for model in (Game, Move):
+                table = model._meta.db_table
+                cursor.execute(
+                    "SELECT seq FROM sqlite_sequence WHERE name = %s", [table]
+                )
+                row = cursor.fetchone()
+                if row is None:
+                    cursor.execute(
+                        "INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)",
+                        [table, offset],
+                    )
+                elif row[0] < offset:
+                    cursor.execute(
+                        "UPDATE sqlite_sequence SET seq = %s WHERE name = %s",
+                        [offset, table],
+                    )
+        self.stdout.write(f"{shard}: ids start after {offset}")
@@ -0,0 +1,262 @@
+import time
+from datetime import timedelta
+
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.db.models import Count, Exists, OuterRef
+from django.utils import timezone
+
+# Project imports
+from games.models import Game, Move
+from games.sharding import get_shards
+
+DEFAULT_RETENTION = {
+    # Unfinished games without moves for this many days are considered abandoned
+    "IDLE_DAYS": 30,
+    # Finished games are kept for this many days after their last move
+    "FINISHED_DAYS": 365,
+    # Only the most recent games of each user are kept, None for no limit
+    "MAX_GAMES_PER_USER": None,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes abandoned and expired games according to the GAMES_RETENTION "
+        "setting. Games are deleted in small transactions so the database write "
+        "lock is never held for long. Meant to be run periodically, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        retention = {**DEFAULT_RETENTION, **getattr(settings, "GAMES_RETENTION", {})}
+        parser.add_argument(
+            "--idle-days",
+            type=int,
+            default=retention["IDLE_DAYS"],
+            help="Delete unfinished games without moves for this many days.",
+        )
+        parser.add_argument(
+            "--finished-days",
+            type=int,
+            default=retention["FINISHED_DAYS"],
+            help="Delete finished games without moves for this many days.",
+        )
+        parser.add_argument(
+            "--max-games-per-user",
+            type=int,
+            default=retention["MAX_GAMES_PER_USER"],
+            help="Delete the oldest games of users with more games than this.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of games deleted per transaction.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.05,
+            help="Seconds to wait between batches, so live requests can write.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count the games that would be deleted without deleting them.",
+        )
+        parser.add_argument(
+            "--vacuum",
+            action="store_true",
+            help="Run an incremental vacuum to return the freed pages to the file system (SQLite only).",
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options["batch_size"]
+        self.pause = options["pause"]
+        self.dry_run = options["dry_run"]
+        self.deleted = {"games": 0, "moves": 0}
+        self.elapsed = 0.0
+
+        now = timezone.now()
+        spaces = {}
+        for shard in get_shards():
+            self.shard = shard
+            spaces[shard] = self.get_space_stats()
+            if options["idle_days"] is not None:
+                self.delete_inactive(
+                    "idle", now - timedelta(days=options["idle_days"]), finished=False
+                )
+            if options["finished_days"] is not None:
+                self.delete_inactive(
+                    "finished",
+                    now - timedelta(days=options["finished_days"]),
+                    finished=True,
+                )
+            if options["max_games_per_user"] is not None:
+                self.delete_over_cap(options["max_games_per_user"])
+
+        if self.dry_run:
+            # Games matching several rules are counted once per rule
+            self.stdout.write(
+                f"Would delete up to {self.deleted['games']} games and "
+                f"{self.deleted['moves']} moves"
+            )
+            return
+
+        rows = sum(self.deleted.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {self.deleted['games']} games and {self.deleted['moves']} moves "
+                f"in {self.elapsed:.2f}s ({rows / max(self.elapsed, 1e-9):,.0f} rows/s)"
+            )
+        )
+
+        for shard, space_before in spaces.items():
+            if not space_before:
+                continue
+            self.shard = shard
+            space_after = self.get_space_stats()
+            space_vacuumed = space_after
+            if options["vacuum"] and self.incremental_vacuum():
+                space_vacuumed = self.get_space_stats()
+            self.report_space(space_before, space_after, space_vacuumed)
+
+    def delete_inactive(self, name, cutoff, finished):
+        """
+        Deletes games created before the cutoff that have no moves after it,
+        either finished or unfinished ones.
+        """
+        recent_moves = Move.objects.using(self.shard).filter(
+            game=OuterRef("pk"), created_at__gte=cutoff
+        )
+        games = (
+            Game.objects.using(self.shard)
+            .filter(game_winner__isnull=not finished, created_at__lt=cutoff)
+            .filter(~Exists(recent_moves))
+        )
+
+        if self.dry_run:
+            self.count(name, games)
+            return
+
+        before = self.deleted["games"]
+        while True:
+            ids = list(
+                games.order_by("id").values_list("id", flat=True)[: self.batch_size]
+            )
+            if not ids:
+                break
+            self.delete_batch(ids)
+        self.stdout.write(f"{name}: {self.deleted['games'] - before} games")
+
+    def delete_over_cap(self, max_games):
+        """
+        Deletes the oldest games of every user with more than max_games games.
+        """
+        players = (
+            Game.objects.using(self.shard)
+            .values("player")
+            .annotate(game_count=Count("id"))
+            .filter(game_count__gt=max_games)
+            .values_list("player", flat=True)
+        )
+
+        before = self.deleted["games"]
+        for player_id in players.iterator():
+            # Walks the (player, created_at, id) index from the newest game
+            games = (
+                Game.objects.using(self.shard)
+                .filter(player_id=player_id)
+                .order_by("-created_at", "-id")[max_games:]
+            )
+            if self.dry_run:
+                self.count("capped", games, report=False)
+                continue
+
+            while True:
+                ids = list(games.values_list("id", flat=True)[: self.batch_size])
+                if not ids:
+                    break
+                self.delete_batch(ids)
+        self.stdout.write(f"capped: {self.deleted['games'] - before} games")
+
+    def delete_batch(self, ids):
+        start = time.perf_counter()
+        with transaction.atomic(using=self.shard):
+            moves_deleted, _ = (
+                Move.objects.using(self.shard).filter(game_id__in=ids).delete()
+            )
+            games_deleted, _ = (
+                Game.objects.using(self.shard).filter(id__in=ids).delete()
+            )
+        self.elapsed += time.perf_counter() - start
+        self.deleted["moves"] += moves_deleted
+        self.deleted["games"] += games_deleted
+
+        if self.pause:
+            time.sleep(self.pause)
+
+    def count(self, name, games, report=True):
+        game_count = games.count()
+        self.deleted["games"] += game_count
+        self.deleted["moves"] += (
+            Move.objects.using(self.shard)
+            .filter(game_id__in=games.values("id"))
+            .count()
+        )
+        if report:
+            self.stdout.write(f"{name}: {game_count} games")
+
+    def get_space_stats(self):
+        """
+        Returns the page size, page count and free page count of the SQLite
+        database of the current shard, or None for other databases.
+        """
+        connection = connections[self.shard]
+        if connection.vendor != "sqlite":
+            return None
+        with connection.cursor() as cursor:
+            stats = {}
+            for pragma in ("page_size", "page_count", "freelist_count"):
+                cursor.execute(f"PRAGMA {pragma}")
+                stats[pragma] = cursor.fetchone()[0]
+        return stats
+
+    def incremental_vacuum(self):
+        """
+        Releases the free pages of the database file. Returns False if the
+        database isn't set up for incremental vacuums.
+        """
+        connection = connections[self.shard]
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA auto_vacuum")
+            # 2 is INCREMENTAL, the only mode where freed pages can be released on demand
+            if cursor.fetchone()[0] != 2:
+                self.stdout.write(
+                    self.style.WARNING(
+                        "Skipping the vacuum, the database doesn't use incremental "
+                        "auto vacuum. Enable it once with "
+                        "'PRAGMA auto_vacuum = INCREMENTAL; VACUUM;'"
+                    )
+                )
+                return False
+        # The sqlite3 module only steps this pragma once, which frees a single
+        # page. executescript runs it to completion.
+        connection.connection.executescript("PRAGMA incremental_vacuum;")
+        return True
+
+    def report_space(self, before, after, vacuumed):
+        """
+        Reports the pages freed by the deletes, which SQLite reuses for new rows,
+        and the space returned to the file system by the vacuum.
+        """
+        page_size = after["page_size"]
+        freed = max(after["freelist_count"] - before["freelist_count"], 0)
+        released = max(after["page_count"] - vacuumed["page_count"], 0)
+        self.stdout.write(
+            f"{self.shard}: freed {freed} pages ({freed * page_size / 1024:,.0f} KiB), "
+            f"released {released * page_size / 1024:,.0f} KiB to the file system, "
+            f"database size is {vacuumed['page_count'] * page_size / 1024:,.0f} KiB"
+        )
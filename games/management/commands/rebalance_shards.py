@@ -0,0 +1,124 @@
+import time
+
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+# Project imports
+from games.models import Game, Move
+from games.sharding import get_shard_for_user, get_shards
+
+# Keeps the inserts under SQLite's limit of 999 query parameters
+INSERT_BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves every game and its moves to the shard of the user who owns it, "
+        "after sharding was enabled or the number of shards changed. Reads the "
+        "default database, the current shards and the databases given with "
+        "--from-db. Games keep their ids. Safe to rerun after an interruption."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of games read per batch.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count the games that would be moved without moving them.",
+        )
+        parser.add_argument(
+            "--from-db",
+            nargs="+",
+            default=[],
+            help=(
+                "Other databases to move games out of, e.g. the shards retired "
+                "by lowering GAMES_SHARD_COUNT."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        self.dry_run = options["dry_run"]
+        self.moved = 0
+        start = time.perf_counter()
+
+        for alias in options["from_db"]:
+            if alias not in settings.DATABASES:
+                raise CommandError(
+                    f"Unknown database: {alias}. Retired shards are declared with "
+                    "the GAMES_RETIRED_SHARDS environment variable."
+                )
+
+        # Games stay in the default database until sharding is enabled
+        sources = [*get_shards(), DEFAULT_DB_ALIAS, *options["from_db"]]
+        for source in dict.fromkeys(sources):
+            self.rebalance(source, options["batch_size"])
+
+        elapsed = time.perf_counter() - start
+        verb = "Would move" if self.dry_run else "Moved"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {self.moved} games in {elapsed:.2f}s")
+        )
+
+    def rebalance(self, shard, batch_size):
+        """
+        Walks the games of the database by id and moves the ones whose player
+        belongs to another shard.
+        """
+        last_id = 0
+        while True:
+            games = list(
+                Game.objects.using(shard)
+                .filter(id__gt=last_id)
+                .order_by("id")[:batch_size]
+            )
+            if not games:
+                break
+            last_id = games[-1].id
+
+            misplaced = {}
+            for game in games:
+                target = get_shard_for_user(game.player_id)
+                if target != shard:
+                    misplaced.setdefault(target, []).append(game)
+
+            for target, target_games in misplaced.items():
+                self.moved += len(target_games)
+                if not self.dry_run:
+                    self.move_games(target_games, shard, target)
+        self.stdout.write(f"{shard}: done")
+
+    def move_games(self, games, source, target):
+        """
+        Copies the games and their moves to the target shard and then deletes
+        them from the source. Copies left by an interrupted run are replaced.
+        """
+        ids = [game.id for game in games]
+        moves = list(Move.objects.using(source).filter(game_id__in=ids))
+
+        with transaction.atomic(using=target):
+            Move.objects.using(target).filter(game_id__in=ids).delete()
+            Game.objects.using(target).filter(id__in=ids).delete()
+            self.copy(Game, games, target)
+            self.copy(Move, moves, target)
+
+        with transaction.atomic(using=source):
+            Move.objects.using(source).filter(game_id__in=ids).delete()
+            Game.objects.using(source).filter(id__in=ids).delete()
+
+    def copy(self, model, objs, target):
+        # bulk_create sets auto_now_add fields to the current time, the original
+        # timestamps are written back afterwards
+        created_at = [obj.created_at for obj in objs]
+        model.objects.using(target).bulk_create(objs, batch_size=INSERT_BATCH_SIZE)
+        for obj, timestamp in zip(objs, created_at):
+            obj.created_at = timestamp
+        model.objects.using(target).bulk_update(
+            objs, ["created_at"], batch_size=INSERT_BATCH_SIZE
+        )
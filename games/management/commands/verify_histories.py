@@ -0,0 +1,217 @@
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Django imports
+import django
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, transaction
+from django.db.models import TextField
+from django.db.models.functions import Cast
+
+# Project imports
+from games.models import Game, Move
+from games.replay import ReplayMove, replay_games
+from games.sharding import get_shards
+
+REPAIRED_FIELDS = ["ply", "x", "y", "position_key"]
+
+
+class InlineExecutor:
+    """
+    Runs the replays in this process, with the interface of an executor.
+    """
+
+    def submit(self, function, *args):
+        return CompletedFuture(function(*args))
+
+    def shutdown(self):
+        pass
+
+
+class CompletedFuture:
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
+
+
+class Command(BaseCommand):
+    help = (
+        "Replays the stored move history of every game through the game rules, "
+        "checking that every move is a legal placement, that the winner matches "
+        "the final board and that the derived move columns match the boards. "
+        "Games are read in chunks and replayed on a process pool. Use --repair to "
+        "fix the winners and derived columns of games with legal histories."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of games read per query and replayed per task.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            # One core is left for reading the games
+            default=(os.cpu_count() or 1) - 1,
+            help="Number of worker processes, 0 to replay in this process.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to wait between chunks, so live requests can use the database.",
+        )
+        parser.add_argument(
+            "--repair",
+            action="store_true",
+            help="Fix the winner and derived columns of games with legal histories.",
+        )
+        parser.add_argument(
+            "--show",
+            type=int,
+            default=20,
+            help="Number of issues printed.",
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.games = 0
+        self.moves = 0
+        self.issues = Counter()
+        self.shown = 0
+        self.repaired = Counter()
+        start = time.perf_counter()
+
+        if options["workers"]:
+            # Workers set up Django themselves, so this also works when processes
+            # are spawned instead of forked
+            executor = ProcessPoolExecutor(options["workers"], initializer=django.setup)
+        else:
+            executor = InlineExecutor()
+        try:
+            for shard in get_shards():
+                self.verify(shard, executor)
+        finally:
+            executor.shutdown()
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"Replayed {self.games} games and {self.moves} moves in {elapsed:.2f}s "
+            f"({self.moves / max(elapsed, 1e-9):,.0f} moves/s)"
+        )
+        for code, count in sorted(self.issues.items()):
+            self.stdout.write(self.style.WARNING(f"{count} {code}"))
+        if not self.issues:
+            self.stdout.write(self.style.SUCCESS("No issues found"))
+        for field, count in sorted(self.repaired.items()):
+            self.stdout.write(self.style.SUCCESS(f"Repaired {count} {field}"))
+
+    def verify(self, shard, executor):
+        """
+        Reads the games of the shard in chunks by primary key and replays them,
+        keeping a few chunks in flight so the workers stay busy while the next
+        chunk is read.
+        """
+        in_flight = deque()
+        max_in_flight = 2 * max(self.options["workers"], 1)
+        for chunk in self.read_chunks(shard):
+            in_flight.append(executor.submit(replay_games, chunk))
+            if len(in_flight) >= max_in_flight:
+                self.handle_results(shard, in_flight.popleft().result())
+            if self.options["pause"]:
+                time.sleep(self.options["pause"])
+        while in_flight:
+            self.handle_results(shard, in_flight.popleft().result())
+
+    def read_chunks(self, shard):
+        """
+        Yields lists of (game_id, game_winner, moves) tuples. The moves of a
+        chunk are read with one range query over the game ids.
+        """
+        last_id = 0
+        while True:
+            games = list(
+                Game.objects.using(shard)
+                .filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", "game_winner")[: self.options["chunk_size"]]
+            )
+            if not games:
+                return
+            last_id = games[-1][0]
+
+            moves = {game_id: [] for game_id, _ in games}
+            rows = (
+                Move.objects.using(shard)
+                .filter(game_id__gte=games[0][0], game_id__lte=last_id)
+                # The boards are decoded by the workers
+                .annotate(board_json=Cast("board_state", TextField()))
+                .order_by("game_id", "created_at", "id")
+                .values_list(
+                    "game_id",
+                    "id",
+                    "move_by",
+                    "board_json",
+                    "ply",
+                    "x",
+                    "y",
+                    "position_key",
+                )
+            )
+            for game_id, *fields in rows.iterator():
+                if game_id in moves:
+                    moves[game_id].append(ReplayMove(*fields))
+
+            self.games += len(games)
+            self.moves += sum(len(game_moves) for game_moves in moves.values())
+            yield [(game_id, winner, moves[game_id]) for game_id, winner in games]
+
+    def handle_results(self, shard, replays):
+        winners = {}
+        repairs = {}
+        for replay in replays:
+            for ply, code, message in replay.issues:
+                self.issues[code] += 1
+                if self.shown < self.options["show"]:
+                    self.shown += 1
+                    self.stdout.write(
+                        f"{shard} game {replay.game_id} ply {ply}: {message}"
+                    )
+
+            # Histories with illegal moves need a person to look at them
+            if all(code == "winner_mismatch" for _, code, _ in replay.issues):
+                if replay.issues:
+                    winners[replay.game_id] = replay.winner
+                repairs.update(replay.repairs)
+            else:
+                self.issues["unrepairable_games"] += 1
+
+        if self.options["repair"] and (winners or repairs):
+            self.repair(shard, winners, repairs)
+
+    def repair(self, shard, winners, repairs):
+        try:
+            with transaction.atomic(using=shard):
+                for game_id, winner in winners.items():
+                    Game.objects.using(shard).filter(id=game_id).update(
+                        game_winner=winner
+                    )
+                Move.objects.using(shard).bulk_update(
+                    [Move(id=move_id, **fields) for move_id, fields in repairs.items()],
+                    REPAIRED_FIELDS,
+                    batch_size=100,
+                )
+        except IntegrityError as error:
+            # e.g. two moves of a game swapping plies
+            self.stdout.write(
+                self.style.ERROR(f"Could not repair a chunk of {shard}: {error}")
+            )
+            return
+        self.repaired["winners"] += len(winners)
+        self.repaired["moves"] += len(repairs)
@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Project imports
+from games.warmup import summarize_import_times
+
+# Loads the WSGI application in a fresh interpreter, which warms it up, and
+# prints the timings of the warmup steps
+STARTUP_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from tictactoe.wsgi import application
+from games.warmup import timings
+print(json.dumps({"total": time.perf_counter() - start, "steps": timings}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Starts the WSGI application in a fresh Python process and reports the "
+        "startup time, the import time of the slowest packages and the time "
+        "of every warmup step."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=15,
+            help="Number of packages shown in the import time report.",
+        )
+
+    def handle(self, *args, **options):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env={
+                **os.environ,
+                "DJANGO_SETTINGS_MODULE": os.environ.get(
+                    "DJANGO_SETTINGS_MODULE", "tictactoe.settings"
+                ),
+            },
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"The application failed to start:\n{result.stderr}")
+        startup = json.loads(result.stdout.strip().splitlines()[-1])
+        imports = summarize_import_times(result.stderr.splitlines())
+
+        self.stdout.write(f"Startup took {startup['total'] * 1000:.0f} ms")
+        self.stdout.write(f"\n{'package':<30} {'import ms':>10}")
+        for package, seconds in imports[: options["top"]]:
+            self.stdout.write(f"{package:<30} {seconds * 1000:>10.1f}")
+
+        self.stdout.write(f"\n{'warmup step':<30} {'ms':>10}")
+        for step, seconds, error in startup["steps"]:
+            self.stdout.write(f"{step:<30} {seconds * 1000:>10.1f}")
+            if error:
+                self.stdout.write(self.style.WARNING(f"  failed: {error}"))
@@ -0,0 +1,190 @@
+import math
+import time
+
+import numpy as np
+
+from games.constants import PLAYER, COMPUTER
+from games.evaluator import (
+    COMPUTER_WON,
+    IN_PROGRESS,
+    LINES,
+    PLAYER_WON,
+    TIED,
+    evaluate_cells,
+)
+from games.services import GameLogicService
+
+# Cell values, the same ones used by games.evaluator
+EMPTY = 0
+PLAYER_CELL = 1
+COMPUTER_CELL = 2
+
+CELL_VALUES = {
+    GameLogicService.EMPTY_SPACE: EMPTY,
+    GameLogicService.get_player_token(PLAYER): PLAYER_CELL,
+    GameLogicService.get_player_token(COMPUTER): COMPUTER_CELL,
+}
+PLAYER_CELLS = {PLAYER: PLAYER_CELL, COMPUTER: COMPUTER_CELL}
+# Result that counts as a win for each cell value
+WINNING_RESULTS = {PLAYER_CELL: PLAYER_WON, COMPUTER_CELL: COMPUTER_WON}
+
+
+def run_playouts(cells, to_move, count, rng):
+    """
+    Plays count random games from the given position at once, and returns the
+    result of each one (see games.evaluator). Every playout fills the empty cells
+    in a random order, alternating tokens starting with to_move. The winner is
+    the first player to complete a line, found by tracking when each cell was
+    filled instead of replaying the games one move at a time.
+    """
+    empty = np.flatnonzero(cells == EMPTY)
+    boards = np.tile(cells, (count, 1))
+    if not len(empty):
+        return evaluate_cells(boards)
+
+    # Random order of the empty cells for every playout
+    order = empty[np.argsort(rng.random((count, len(empty))), axis=1)]
+    turns = np.arange(1, len(empty) + 1)
+    tokens = np.where(turns % 2 == 1, to_move, 3 - to_move).astype(np.int8)
+
+    rows = np.arange(count)[:, np.newaxis]
+    boards[rows, order] = tokens
+    # Turn in which each cell was filled, cells that weren't empty count as turn 0
+    filled_at = np.zeros(boards.shape, dtype=np.int64)
+    filled_at[rows, order] = turns
+
+    line_cells = boards[:, LINES]
+    completed_at = filled_at[:, LINES].max(axis=2)
+    never = len(empty) + 1
+    player_at = np.where(
+        (line_cells == PLAYER_CELL).all(axis=2), completed_at, never
+    ).min(axis=1)
+    computer_at = np.where(
+        (line_cells == COMPUTER_CELL).all(axis=2), completed_at, never
+    ).min(axis=1)
+
+    results = np.full(count, TIED, dtype=np.int8)
+    results[player_at < computer_at] = PLAYER_WON
+    results[computer_at < player_at] = COMPUTER_WON
+    return results
+
+
+class Node:
+    def __init__(self, cells, to_move, parent=None, move=None):
+        self.cells = cells
+        self.to_move = to_move
+        self.parent = parent
+        self.move = move
+        self.children = []
+        self.visits = 0
+        # Sum of the rewards for the player that made the move leading here
+        self.value = 0.0
+        self.result = evaluate_cells(cells[np.newaxis])[0]
+        if self.result == IN_PROGRESS:
+            self.untried_moves = list(np.flatnonzero(cells == EMPTY))
+        else:
+            self.untried_moves = []
+
+    @property
+    def moved(self):
+        # Cell value of the player that made the move leading to this node
+        return 3 - self.to_move
+
+    def is_terminal(self):
+        return self.result != IN_PROGRESS
+
+    def best_child(self, exploration):
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda child: child.value / child.visits
+            + exploration * math.sqrt(log_visits / child.visits),
+        )
+
+    def expand(self):
+        cell = self.untried_moves.pop()
+        cells = self.cells.copy()
+        cells[cell] = self.to_move
+        child = Node(cells, 3 - self.to_move, parent=self, move=cell)
+        self.children.append(child)
+        return child
+
+
+class MonteCarloTreeSearch:
+    """
+    Monte Carlo tree search opponent. Each iteration walks down the tree with
+    UCT, expands one node and runs a batch of random playouts from it as
+    vectorized NumPy operations. The search stops when the playout budget is
+    spent or, if a time limit is given, when the time is up.
+    """
+
+    def __init__(
+        self, playouts=4096, time_limit=None, batch_size=64, exploration=1.4, seed=None
+    ):
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.batch_size = batch_size
+        self.exploration = exploration
+        self.rng = np.random.default_rng(seed)
+        # Statistics of the latest search
+        self.playouts_run = 0
+        self.elapsed = 0.0
+
+    @property
+    def playouts_per_second(self):
+        if not self.elapsed:
+            return 0.0
+        return self.playouts_run / self.elapsed
+
+    def choose_move(self, board, player_type=COMPUTER):
+        """
+        Returns the (x, y) coordinates of the move chosen for the given player
+        on the given 3 x 3 board. Raises ValueError if the game is already over.
+        """
+        cells = np.array(
+            [CELL_VALUES[token] for row in board for token in row], dtype=np.int8
+        )
+        root = Node(cells, PLAYER_CELLS[player_type])
+        if root.is_terminal():
+            raise ValueError("Cannot choose a move, the game is already over")
+
+        start = time.perf_counter()
+        self.playouts_run = 0
+        while self.playouts_run < self.playouts:
+            if (
+                self.time_limit is not None
+                and time.perf_counter() - start >= self.time_limit
+            ):
+                break
+            self.iterate(root)
+        self.elapsed = time.perf_counter() - start
+
+        if not root.children:
+            # No time for a single iteration, any move is as good as another
+            return divmod(int(root.untried_moves[0]), 3)
+
+        best = max(root.children, key=lambda child: child.visits)
+        return divmod(int(best.move), 3)
+
+    def iterate(self, root):
+        node = root
+        while not node.untried_moves and node.children:
+            node = node.best_child(self.exploration)
+        if node.untried_moves:
+            node = node.expand()
+
+        if node.is_terminal():
+            results = np.full(self.batch_size, node.result, dtype=np.int8)
+        else:
+            results = run_playouts(node.cells, node.to_move, self.batch_size, self.rng)
+        self.playouts_run += self.batch_size
+
+        wins = {
+            cell: int(np.count_nonzero(results == result))
+            for cell, result in WINNING_RESULTS.items()
+        }
+        ties = int(np.count_nonzero(results == TIED))
+        while node is not None:
+            node.visits += self.batch_size
+            node.value += wins[node.moved] + 0.5 * ties
+            node = node.parent
@@ -0,0 +1,60 @@
+# Generated by Django 5.0.4 on 2026-10-19 04:08
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+from games.boards import get_position_key
+
+# Kept below SQLite's default limit of 999 query parameters
+BACKFILL_BATCH_SIZE = 900
+
+
+def backfill_position_keys(apps, schema_editor):
+    """
+    Computes the position key of every existing move. Moves are read in batches
+    by primary key, and each batch is written with one UPDATE per distinct key.
+    """
+    Move = apps.get_model("games", "Move")
+    db_alias = schema_editor.connection.alias
+    moves = Move.objects.using(db_alias)
+
+    last_id = 0
+    while True:
+        batch = list(
+            moves.filter(id__gt=last_id, position_key__isnull=True)
+            .order_by("id")
+            .values_list("id", "board_state")[:BACKFILL_BATCH_SIZE]
+        )
+        if not batch:
+            break
+
+        ids_by_key = defaultdict(list)
+        for move_id, board_state in batch:
+            ids_by_key[get_position_key(board_state)].append(move_id)
+        for position_key, ids in ids_by_key.items():
+            moves.filter(id__in=ids).update(position_key=position_key)
+
+        last_id = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0005_game_game_winner"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="move",
+            name="position_key",
+            field=models.PositiveIntegerField(
+                db_index=True,
+                help_text="Canonical key of board_state under the 8 board symmetries. Computed with games.boards.get_position_key.",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(
+            backfill_position_keys, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.4 on 2026-10-19 04:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0006_move_position_key"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(
+                fields=["player", "created_at", "id"], name="game_player_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="move",
+            index=models.Index(
+                fields=["game", "created_at", "id"], name="move_game_created_idx"
+            ),
+        ),
+    ]
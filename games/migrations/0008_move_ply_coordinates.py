@@ -0,0 +1,104 @@
+# Generated by Django 5.0.4 on 2026-10-19 04:18
+
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def get_placed_space(previous_board, board):
+    """
+    Returns the (x, y) coordinates of the only space that differs between both
+    boards, or (None, None) if there isn't exactly one.
+    """
+    changed = [
+        (i, j)
+        for i in range(3)
+        for j in range(3)
+        if previous_board[i][j] != board[i][j]
+    ]
+    if len(changed) != 1:
+        return None, None
+    return changed[0]
+
+
+def backfill_plies(apps, schema_editor):
+    """
+    Numbers the moves of every game in chronological order, and works out the
+    space of each move by comparing its board with the previous one. Games
+    are processed in batches by primary key.
+    """
+    Game = apps.get_model("games", "Game")
+    Move = apps.get_model("games", "Move")
+    db_alias = schema_editor.connection.alias
+    empty_board = [[".", ".", "."], [".", ".", "."], [".", ".", "."]]
+
+    last_id = 0
+    while True:
+        game_ids = list(
+            Game.objects.using(db_alias)
+            .filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:BACKFILL_BATCH_SIZE]
+        )
+        if not game_ids:
+            break
+        last_id = game_ids[-1]
+
+        moves = (
+            Move.objects.using(db_alias)
+            .filter(game_id__gte=game_ids[0], game_id__lte=last_id)
+            .order_by("game_id", "created_at", "id")
+            .values_list("id", "game_id", "board_state")
+        )
+        updated = []
+        current_game_id = None
+        for move_id, game_id, board_state in moves:
+            if game_id != current_game_id:
+                current_game_id = game_id
+                ply = 0
+                previous_board = empty_board
+            ply += 1
+            x, y = get_placed_space(previous_board, board_state)
+            updated.append(Move(id=move_id, ply=ply, x=x, y=y))
+            previous_board = board_state
+
+        Move.objects.using(db_alias).bulk_update(updated, ["ply", "x", "y"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0007_game_move_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="move",
+            name="ply",
+            field=models.PositiveSmallIntegerField(
+                help_text="Number of the move within its game, starting at 1 for the first move.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="move",
+            name="x",
+            field=models.PositiveSmallIntegerField(
+                help_text="Row of the space where the token was placed.", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="move",
+            name="y",
+            field=models.PositiveSmallIntegerField(
+                help_text="Column of the space where the token was placed.", null=True
+            ),
+        ),
+        migrations.RunPython(backfill_plies, reverse_code=migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="move",
+            constraint=models.UniqueConstraint(
+                fields=("game", "ply"), name="unique_move_ply"
+            ),
+        ),
+    ]
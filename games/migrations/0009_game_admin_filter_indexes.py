@@ -0,0 +1,21 @@
+# Generated by Django 5.0.4 on 2026-10-19 04:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0008_move_ply_coordinates"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(fields=["game_winner"], name="game_winner_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(fields=["created_at"], name="game_created_idx"),
+        ),
+    ]
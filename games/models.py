@@ -2,6 +2,7 @@ from random import randint
 
 # Django imports
 from django.db import models
+from django.db.models import OuterRef, Subquery
 from django.contrib.auth.models import User
 
 # Project imports
@@ -9,11 +10,41 @@ from games.constants import PLAYER_CHOICES, PLAYER, COMPUTER, WINNER_CHOICES
 from games.exceptions import InvalidMove, InvalidPlayer
 
 
+class GameQuerySet(models.QuerySet):
+    def with_current_board(self):
+        """
+        Annotates each game with the board of its latest move as current_board,
+        which is None for games without moves. Lets a page of games be
+        serialized with a single query.
+        """
+        latest_moves = Move.objects.filter(game=OuterRef("pk")).order_by(
+            "-created_at", "-id"
+        )
+        return self.annotate(
+            current_board=Subquery(latest_moves.values("board_state")[:1])
+        )
+
+
 class Game(models.Model):
-    player = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Without a database constraint, since games can be stored in a shard
+    # that doesn't have the users table (see games.routers)
+    player = models.ForeignKey(User, on_delete=models.CASCADE, db_constraint=False)
     created_at = models.DateTimeField(auto_now_add=True)
     game_winner = models.CharField(max_length=30, choices=WINNER_CHOICES, null=True)
 
+    objects = GameQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Listing and paginating a user's games
+            models.Index(
+                fields=["player", "created_at", "id"], name="game_player_created_idx"
+            ),
+            # Admin filters
+            models.Index(fields=["game_winner"], name="game_winner_idx"),
+            models.Index(fields=["created_at"], name="game_created_idx"),
+        ]
+
     def __str__(self):
         return f"Game {self.id} - Player: {self.player.username}"
 
@@ -25,3 +56,30 @@ class Move(models.Model):
     board_state = models.JSONField(
         help_text="Board state after executing the move. Board states are stored as a 3 x 3 matrix representing the board."
     )
+    position_key = models.PositiveIntegerField(
+        null=True,
+        db_index=True,
+        help_text="Canonical key of board_state under the 8 board symmetries. Computed with games.boards.get_position_key.",
+    )
+    ply = models.PositiveSmallIntegerField(
+        null=True,
+        help_text="Number of the move within its game, starting at 1 for the first move.",
+    )
+    x = models.PositiveSmallIntegerField(
+        null=True, help_text="Row of the space where the token was placed."
+    )
+    y = models.PositiveSmallIntegerField(
+        null=True, help_text="Column of the space where the token was placed."
+    )
+
+    class Meta:
+        indexes = [
+            # Paginating a game's moves and finding its latest move
+            models.Index(
+                fields=["game", "created_at", "id"], name="move_game_created_idx"
+            ),
+        ]
+        constraints = [
+            # Also the index used to fetch the moves after a given ply
+            models.UniqueConstraint(fields=["game", "ply"], name="unique_move_ply"),
+        ]
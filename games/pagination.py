@@ -0,0 +1,97 @@
+import base64
+import binascii
+import json
+
+# Django / DRF imports
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination ordered by (created_at, id). Each page starts right after
+    the last row of the previous one through an indexed range filter, so deep
+    pages cost the same as the first one. The response body is the same list
+    returned without pagination, and the URL of the next page, if there is one,
+    is sent in a Link header.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = getattr(settings, "GAMES_PAGE_SIZE", 100)
+    max_page_size = getattr(settings, "GAMES_MAX_PAGE_SIZE", 1000)
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        if cursor:
+            created_at, pk = cursor
+            # Written so the range on created_at can use the index
+            queryset = queryset.filter(
+                Q(created_at__gte=created_at)
+                & (Q(created_at__gt=created_at) | Q(id__gt=pk))
+            )
+
+        results = list(queryset.order_by("created_at", "id")[: page_size + 1])
+        self.next_cursor = None
+        if len(results) > page_size:
+            results = results[:page_size]
+            self.next_cursor = self.encode_cursor(results[-1])
+
+        return results
+
+    def get_paginated_response(self, data):
+        headers = {}
+        next_link = self.get_next_link()
+        if next_link:
+            headers["Link"] = f'<{next_link}>; rel="next"'
+        return Response(data, headers=headers)
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, instance):
+        """
+        Returns an opaque cursor pointing right after the given instance.
+        """
+        position = json.dumps([instance.created_at.isoformat(), instance.id])
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    def decode_cursor(self, request):
+        """
+        Returns the (created_at, id) position encoded in the request's cursor,
+        or None if there's no cursor. Raises NotFound if the cursor is invalid.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            created_at, pk = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            created_at = parse_datetime(created_at)
+            if created_at is None or not isinstance(pk, int):
+                raise ValueError()
+        except (binascii.Error, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return created_at, pk
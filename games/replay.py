@@ -0,0 +1,145 @@
+import json
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from games.boards import BOARD_KEYS, encode_board, get_canonical_key
+from games.constants import PLAYER, COMPUTER
+from games.evaluator import get_winners
+from games.services import GameLogicService
+
+# Moves as read by verify_histories, in the order they were made. The board
+# is the JSON text of Move.board_state, which is much cheaper to send to
+# another process than the decoded board.
+ReplayMove = namedtuple(
+    "ReplayMove", ["id", "move_by", "board_state", "ply", "x", "y", "position_key"]
+)
+
+# Outcome of replaying a game. Issues are (ply, code, message) tuples, winner
+# is the winner of the final board and repairs maps the ids of the moves with
+# wrong derived columns to their correct values.
+Replay = namedtuple("Replay", ["game_id", "issues", "winner", "repairs"])
+
+
+@lru_cache(maxsize=None)
+def get_winner_table():
+    """
+    Returns the winner of every board, indexed by board key. Computed once
+    per process with the vectorized evaluator, which follows the same rules
+    as GameLogicService.get_board_winner.
+    """
+    return get_winners(np.arange(BOARD_KEYS)).tolist()
+
+
+def get_board_key(board):
+    """
+    Returns the key of the board, or None if it isn't a 3 x 3 matrix of
+    valid tokens.
+    """
+    if not (
+        isinstance(board, list)
+        and len(board) == 3
+        and all(isinstance(row, list) and len(row) == 3 for row in board)
+    ):
+        return None
+    try:
+        return encode_board(board)
+    except (TypeError, ValueError):
+        return None
+
+
+def replay_game(game_id, stored_winner, moves):
+    """
+    Replays the moves of a game through the game rules, starting from an
+    empty board. Checks that every board differs from the previous one by
+    exactly one token placed on an empty space by the player whose turn it
+    was, that no move was made after the game was over, that the stored
+    winner is the winner of the final board, and that the ply, coordinates
+    and position key of every move match its board. Pure function, so it
+    can run in another process.
+    """
+    issues = []
+    repairs = {}
+    board = GameLogicService.get_initial_board()
+    winner = None
+    winners = get_winner_table()
+
+    for index, move in enumerate(moves):
+        ply = index + 1
+        if winner is not None:
+            issues.append(
+                (ply, "move_after_game_over", f"the game was over ({winner})")
+            )
+
+        expected_by = PLAYER if index % 2 == 0 else COMPUTER
+        if move.move_by != expected_by:
+            issues.append(
+                (ply, "wrong_turn", f"made by {move.move_by}, expected {expected_by}")
+            )
+
+        try:
+            new_board = json.loads(move.board_state)
+        except (TypeError, ValueError):
+            new_board = move.board_state
+        key = get_board_key(new_board)
+        if key is None:
+            issues.append((ply, "invalid_board", f"unreadable board {new_board!r}"))
+            # The rest of the history can't be checked against this board
+            return Replay(game_id, issues, None, repairs)
+
+        changes = [
+            (x, y) for x in range(3) for y in range(3) if new_board[x][y] != board[x][y]
+        ]
+        if len(changes) != 1:
+            issues.append(
+                (ply, "illegal_move", f"{len(changes)} spaces changed, expected 1")
+            )
+        else:
+            x, y = changes[0]
+            token = GameLogicService.get_player_token(expected_by)
+            if board[x][y] != GameLogicService.EMPTY_SPACE:
+                issues.append((ply, "illegal_move", f"space ({x}, {y}) was occupied"))
+            elif new_board[x][y] != token:
+                issues.append(
+                    (
+                        ply,
+                        "wrong_token",
+                        f"placed {new_board[x][y]!r}, expected {token!r}",
+                    )
+                )
+
+            expected = {
+                "ply": ply,
+                "x": x,
+                "y": y,
+                "position_key": get_canonical_key(key),
+            }
+            actual = {
+                "ply": move.ply,
+                "x": move.x,
+                "y": move.y,
+                "position_key": move.position_key,
+            }
+            if actual != expected:
+                repairs[move.id] = expected
+
+        board = new_board
+        winner = winners[key]
+
+    if stored_winner != winner:
+        issues.append(
+            (
+                len(moves),
+                "winner_mismatch",
+                f"stored {stored_winner}, board says {winner}",
+            )
+        )
+    return Replay(game_id, issues, winner, repairs)
+
+
+def replay_games(games):
+    """
+    Replays a chunk of (game_id, stored_winner, moves) tuples.
+    """
+    return [replay_game(*game) for game in games]
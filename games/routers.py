@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from games.sharding import get_shard_databases, get_shard_for_user
+
+GAMES_APP_LABEL = "games"
+
+
+class GameShardRouter:
+    """
+    Routes Game and Move rows to the shard of the user who owns them (see
+    games.sharding), while every other model stays on the default database.
+
+    Routing relies on the instance hints Django gives routers: a user's games
+    (user.game_set, Game(player=user).save()) go to the user's shard, and a
+    game's moves (game.moves) go to the database the game was read from.
+    Queries without an instance, such as Game.objects.filter(...), have to
+    pick the shard explicitly with using(get_shard_for_user(user_id)).
+    """
+
+    def db_for_read(self, model, **hints):
+        return self.get_shard(model, hints.get("instance"))
+
+    def db_for_write(self, model, **hints):
+        return self.get_shard(model, hints.get("instance"))
+
+    def get_shard(self, model, instance):
+        if instance is None:
+            return None
+
+        if model._meta.app_label != GAMES_APP_LABEL:
+            # Without this, Django would read game.player from the game's shard
+            if instance._meta.app_label == GAMES_APP_LABEL:
+                return DEFAULT_DB_ALIAS
+            return None
+
+        if instance._meta.app_label == GAMES_APP_LABEL:
+            if instance._state.db:
+                return instance._state.db
+            player_id = getattr(instance, "player_id", None)
+            return get_shard_for_user(player_id) if player_id else None
+
+        if instance._meta.label == settings.AUTH_USER_MODEL and instance.pk:
+            return get_shard_for_user(instance.pk)
+
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Games reference users across databases
+        if GAMES_APP_LABEL in (obj1._meta.app_label, obj2._meta.app_label):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db != DEFAULT_DB_ALIAS and db in get_shard_databases():
+            # Shards only hold game data
+            return app_label == GAMES_APP_LABEL
+        # The game tables also exist, empty, in the default database so that
+        # deleting a user there doesn't fail while looking for their games
+        return None
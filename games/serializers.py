@@ -1,8 +1,13 @@
+from django.db import IntegrityError, transaction
+from django.utils.functional import cached_property
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from games import write_behind
+from games.exceptions import MoveConflict
 from games.models import Game
 from games.services import GameLogicService
+from games.sharding import get_shard_for_user
 
 
 class CreateGameSerializer(serializers.ModelSerializer):
@@ -15,7 +20,9 @@ class CreateGameSerializer(serializers.ModelSerializer):
         request = self.context["request"]
         # We get the player from the logged in user
         player = request.user
-        return super().create({**validated_data, "player": player})
+        return Game.objects.using(get_shard_for_user(player.id)).create(
+            **validated_data, player=player
+        )
 
 
 class RetrieveGameSerializer(serializers.ModelSerializer):
@@ -30,10 +37,40 @@ class RetrieveGameSerializer(serializers.ModelSerializer):
         return game_logic.get_current_board()
 
 
+class FastRetrieveGameSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer with the same output as RetrieveGameSerializer, written
+    by hand to skip the per-object field introspection of ModelSerializer. Uses
+    the current_board annotation from Game.objects.with_current_board() when
+    present, and otherwise reads the board from the latest move.
+    """
+
+    def to_representation(self, instance):
+        board = None
+        if write_behind.is_enabled():
+            # Newer than the database while the game's moves are being written
+            board = write_behind.store.get_board(instance.id)
+        if board is None and hasattr(instance, "current_board"):
+            board = instance.current_board or GameLogicService.get_initial_board()
+        elif board is None:
+            board = GameLogicService(instance).get_current_board()
+
+        return {
+            "id": instance.id,
+            "board": board,
+            "game_winner": instance.game_winner,
+        }
+
+
 class MakeMoveSerializer(serializers.Serializer):
     x = serializers.IntegerField()
     y = serializers.IntegerField()
 
+    @cached_property
+    def game_logic(self):
+        # Shared between validation and saving, so the current board is only read once
+        return GameLogicService(self.context["game"])
+
     def validate_coordinate(self, coordinate_name, coordinate_value):
         if coordinate_value < 0 or coordinate_value > 2:
             raise ValidationError(
@@ -51,10 +88,7 @@ class MakeMoveSerializer(serializers.Serializer):
         x_coordinate = attrs["x"]
         y_coordinate = attrs["y"]
 
-        game = self.context["game"]
-        game_logic = GameLogicService(game)
-
-        if not game_logic.is_move_valid(x=x_coordinate, y=y_coordinate):
+        if not self.game_logic.is_move_valid(x=x_coordinate, y=y_coordinate):
             raise ValidationError(
                 f"Space ({x_coordinate}, {y_coordinate}) is already occupied"
             )
@@ -63,12 +97,55 @@ class MakeMoveSerializer(serializers.Serializer):
 
     def save(self):
         game = self.context["game"]
-        game_logic = GameLogicService(game)
-
-        player_move, winner = game_logic.make_player_move(
+        if write_behind.is_enabled():
+            # Pending moves were already acknowledged, so they're written before
+            # the transaction, where a conflict would roll them back
+            write_behind.store.flush_game(game.id)
+        try:
+            # The player's and the computer's moves are written together. Moves
+            # made concurrently on a game compute the same ply, so all but the
+            # first fail the unique (game, ply) constraint.
+            with transaction.atomic(using=game._state.db):
+                return self.make_moves()
+        except IntegrityError:
+            raise MoveConflict()
+
+    def make_moves(self):
+        player_move, winner = self.game_logic.make_player_move(
             x=self.validated_data["x"], y=self.validated_data["y"]
         )
         if winner:
             return player_move, winner
-        computer_move, winner = game_logic.make_computer_move()
+        computer_move, winner = self.game_logic.make_computer_move()
         return computer_move, winner
+
+
+class MovesSinceSerializer(serializers.Serializer):
+    since = serializers.IntegerField(min_value=0)
+
+
+class MoveDeltaSerializer(serializers.BaseSerializer):
+    """
+    Compact representation of a move with its ply, the space where the token
+    was placed and who placed it, without the board.
+    """
+
+    def to_representation(self, instance):
+        return {
+            "ply": instance.ply,
+            "x": instance.x,
+            "y": instance.y,
+            "by": instance.move_by,
+        }
+
+
+class PositionSerializer(serializers.Serializer):
+    board = serializers.CharField(min_length=9, max_length=9)
+
+    def validate_board(self, value):
+        if any(
+            token not in ("X", "O", GameLogicService.EMPTY_SPACE) for token in value
+        ):
+            raise ValidationError("Board must only contain 'X', 'O' and '.' characters")
+        # Convert the board into the 3 x 3 matrix used everywhere else
+        return [list(value[0:3]), list(value[3:6]), list(value[6:9])]
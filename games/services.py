@@ -1,14 +1,42 @@
+import logging
 from random import randint
 
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from games import write_behind
+from games.boards import get_position_key
 from games.constants import PLAYER, COMPUTER, TIE
-from games.exceptions import InvalidMove, InvalidPlayer
+from games.events import publish_move
+from games.exceptions import InvalidMove, InvalidPlayer, MoveConflict, MoveOutOfOrder
+from games.models import Move
+
+logger = logging.getLogger(__name__)
 
 
 class GameLogicService:
     EMPTY_SPACE = "."
 
+    # Winning combinations
+    WINNING_COMBOS = [
+        # Rows
+        [(0, 0), (0, 1), (0, 2)],
+        [(1, 0), (1, 1), (1, 2)],
+        [(2, 0), (2, 1), (2, 2)],
+        # Columns
+        [(0, 0), (1, 0), (2, 0)],
+        [(0, 1), (1, 1), (2, 1)],
+        [(0, 2), (1, 2), (2, 2)],
+        # Diagonal
+        [(0, 0), (1, 1), (2, 2)],
+        [(2, 0), (1, 1), (0, 2)],
+    ]
+
     def __init__(self, game):
         self.game = game
+        # The board after the latest move, loaded on first use and kept up to
+        # date by the moves made through this instance
+        self._current_board = None
 
     @classmethod
     def get_initial_board(cls):
@@ -39,12 +67,24 @@ class GameLogicService:
         """
         Returns the current state of the game's board
         """
-        latest_move = self.game.moves.order_by("-created_at").first()
+        if self._current_board is not None:
+            return self._current_board
+
+        if write_behind.is_enabled():
+            self._current_board = write_behind.store.get_board(self.game.id)
+            if self._current_board is not None:
+                return self._current_board
+            # The board may have been evicted while moves are still pending
+            write_behind.store.flush_game(self.game.id)
+
+        latest_move = self.game.moves.order_by("-created_at", "-id").first()
         if not latest_move:
             # No move has been made yet, return board representing initial state
-            return self.get_initial_board()
+            self._current_board = self.get_initial_board()
+        else:
+            self._current_board = latest_move.board_state
 
-        return latest_move.board_state
+        return self._current_board
 
     def __make_move(self, x, y, board, player):
         """
@@ -53,13 +93,51 @@ class GameLogicService:
         given coordinates are valid. Returns the move and the game winner, if there is one.
         For methods with validations, use make_player_move or make_computer_move instead.
         """
-        new_board = [*board]
+        new_board = [row[:] for row in board]
         new_board[x][y] = self.get_player_token(player_type=player)
 
-        move = self.game.moves.create(move_by=player, board_state=new_board)
+        move = Move(
+            game=self.game,
+            move_by=player,
+            board_state=new_board,
+            position_key=get_position_key(new_board),
+            # Every move places one token, so the ply is the number of tokens
+            ply=9 - len(self.get_empty_spaces(new_board)),
+            x=x,
+            y=y,
+        )
+        if write_behind.is_enabled() and not self.get_board_winner(new_board):
+            # Acknowledged right away, written to the database in the background
+            try:
+                write_behind.store.add(
+                    move, using=self.game._state.db or DEFAULT_DB_ALIAS
+                )
+            except MoveOutOfOrder:
+                # Another request moved first, as the unique (game, ply)
+                # constraint reports when the move is written synchronously
+                raise MoveConflict()
+        else:
+            self.__save_move(move)
+        self._current_board = new_board
         self.__check_game_over(new_board)
+        publish_move(move, self.game.game_winner)
         return move, self.game.game_winner
 
+    def __save_move(self, move):
+        """
+        Writes the move to the game's database. With write-behind enabled, the
+        earlier moves of the game are written first and the game's board is
+        dropped from the store, since this is its final move.
+        """
+        if write_behind.is_enabled():
+            try:
+                write_behind.store.check_ply(self.game.id, move.ply)
+            except MoveOutOfOrder:
+                raise MoveConflict()
+            write_behind.store.flush_game(self.game.id)
+            write_behind.store.forget(self.game.id)
+        move.save(using=self.game._state.db)
+
     def make_player_move(self, x, y):
         """
         Places a player's token in position (x,y). Returns the created Move instance.
@@ -84,15 +162,36 @@ class GameLogicService:
 
         board = self.get_current_board()
 
-        empty_spaces = self.__get_empty_spaces(board)
+        empty_spaces = self.get_empty_spaces(board)
         if not empty_spaces:
             raise InvalidMove("Cannot move, all spaces are already occupied")
 
-        move_index = randint(0, len(empty_spaces) - 1)
-        move_x, move_y = empty_spaces[move_index]
+        if getattr(settings, "GAMES_COMPUTER_OPPONENT", "random") == "mcts":
+            move_x, move_y = self.__choose_mcts_move(board)
+        else:
+            move_index = randint(0, len(empty_spaces) - 1)
+            move_x, move_y = empty_spaces[move_index]
 
         return self.__make_move(x=move_x, y=move_y, board=board, player=COMPUTER)
 
+    def __choose_mcts_move(self, board):
+        """
+        Chooses the computer's move with a Monte Carlo tree search, configured
+        with the GAMES_MCTS_OPTIONS setting.
+        """
+        # Imported here since the search module depends on this one
+        from games.mcts import MonteCarloTreeSearch
+
+        search = MonteCarloTreeSearch(**getattr(settings, "GAMES_MCTS_OPTIONS", {}))
+        move = search.choose_move(board, COMPUTER)
+        logger.debug(
+            "MCTS ran %d playouts in %.3fs (%.0f playouts/s)",
+            search.playouts_run,
+            search.elapsed,
+            search.playouts_per_second,
+        )
+        return move
+
     def is_move_valid(self, x, y):
         """
         Returns true if the move is valid, i.e if game is not over
@@ -101,62 +200,43 @@ class GameLogicService:
         board = self.get_current_board()
         return not self.game.game_winner and board[x][y] is self.EMPTY_SPACE
 
-    def __check_game_over(self, board):
+    @classmethod
+    def get_board_winner(cls, board):
         """
-        Checks whether the game is over, and if so updates the game's game_winner field.
+        Returns the winner for the given board: PLAYER or COMPUTER if either
+        of them has three tokens in a row, TIE if the board is full and no one
+        won, or None if the game is still in progress. Does not touch the database.
         """
-        # Winning combinations
-        winning_combos = [
-            # Rows
-            [(0, 0), (0, 1), (0, 2)],
-            [(1, 0), (1, 1), (1, 2)],
-            [(2, 0), (2, 1), (2, 2)],
-            # Columns
-            [(0, 0), (1, 0), (2, 0)],
-            [(0, 1), (1, 1), (2, 1)],
-            [(0, 2), (1, 2), (2, 2)],
-            # Diagonal
-            [(0, 0), (1, 1), (2, 2)],
-            [(2, 0), (1, 1), (0, 2)],
-        ]
-
-        # Check if player won
-        player_token = self.get_player_token(PLAYER)
-        player_tokens = [
-            [board[i][j] for (i, j) in combo if board[i][j] == player_token]
-            for combo in winning_combos
-        ]
+        for player in (PLAYER, COMPUTER):
+            token = cls.get_player_token(player)
+            for combo in cls.WINNING_COMBOS:
+                if all(board[i][j] == token for (i, j) in combo):
+                    return player
 
-        if any(len(t) == 3 for t in player_tokens):
-            self.game.game_winner = PLAYER
-            self.game.save()
-            return
-
-        # Check if computer won
-        computer_token = self.get_player_token(COMPUTER)
-        computer_tokens = [
-            [board[i][j] for (i, j) in combo if board[i][j] == computer_token]
-            for combo in winning_combos
-        ]
+        # If there are no empty spaces and no one won, it's a tie
+        if not cls.get_empty_spaces(board):
+            return TIE
 
-        if any(len(t) == 3 for t in computer_tokens):
-            self.game.game_winner = COMPUTER
-            self.game.save()
-            return
+        return None
 
-        # If there are no empty spaces and no one won, it's a tie
-        if not self.__get_empty_spaces(board):
-            self.game.game_winner = TIE
+    def __check_game_over(self, board):
+        """
+        Checks whether the game is over, and if so updates the game's game_winner field.
+        """
+        winner = self.get_board_winner(board)
+        if winner:
+            self.game.game_winner = winner
             self.game.save()
 
-    def __get_empty_spaces(self, board):
+    @classmethod
+    def get_empty_spaces(cls, board):
         """
         Returns a list off (x,y) coordinates that correspond to
         the empty positions of the given board
         """
         all_spaces = [(i, j) for i in range(0, 3) for j in range(0, 3)]
         empty_spaces = [
-            (i, j) for (i, j) in all_spaces if board[i][j] is self.EMPTY_SPACE
+            (i, j) for (i, j) in all_spaces if board[i][j] == cls.EMPTY_SPACE
         ]
 
         return empty_spaces
@@ -0,0 +1,45 @@
+import zlib
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Ids of the n-th shard start at (n + 1) << ID_OFFSET_BITS, so games and moves
+# keep unique ids across shards and can be moved between them
+ID_OFFSET_BITS = 40
+
+
+def get_shards():
+    """
+    Returns the database aliases holding game data. Without sharding, games
+    live in the default database.
+    """
+    return getattr(settings, "GAMES_SHARDS", None) or [DEFAULT_DB_ALIAS]
+
+
+def get_shard_databases():
+    """
+    Returns the aliases of every declared shard database, the current shards
+    and the retired ones, which only hold game data.
+    """
+    return list(
+        dict.fromkeys([*get_shards(), *getattr(settings, "GAMES_SHARD_DATABASES", [])])
+    )
+
+
+def get_id_offset(shard):
+    return (get_shards().index(shard) + 1) << ID_OFFSET_BITS
+
+
+def is_sharded():
+    return get_shards() != [DEFAULT_DB_ALIAS]
+
+
+def get_shard_for_user(user_id):
+    """
+    Returns the alias of the database holding the games of the given user.
+    Uses a CRC32 of the user id, which is stable across processes unlike hash().
+    """
+    shards = get_shards()
+    if len(shards) == 1:
+        return shards[0]
+    return shards[zlib.crc32(str(user_id).encode()) % len(shards)]
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from games.models import Game
+from games.sharding import get_shard_for_user, is_sharded
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def delete_sharded_games(sender, instance, using, **kwargs):
+    """
+    Deletes the games of a user that is being deleted when they're stored in
+    a shard, since the cascade only reaches the user's database.
+    """
+    if not is_sharded():
+        return
+    shard = get_shard_for_user(instance.pk)
+    if shard != using:
+        Game.objects.using(shard).filter(player_id=instance.pk).delete()
@@ -0,0 +1,92 @@
+import asyncio
+
+# Django / DRF imports
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+# Project imports
+from games.events import broker, format_event
+from games.models import Game
+from games.services import GameLogicService
+from games.sharding import get_shard_for_user
+
+# Seconds between keepalive comments sent on idle streams
+KEEPALIVE_INTERVAL = getattr(settings, "GAMES_EVENTS_KEEPALIVE_INTERVAL", 15)
+
+
+def authenticate(request):
+    """
+    Authenticates the request with the same authentication classes used by the
+    REST API. Returns the user, which is anonymous if authentication failed.
+    """
+    drf_request = Request(
+        request,
+        authenticators=[
+            authentication()
+            for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        ],
+    )
+    try:
+        return drf_request.user
+    except APIException:
+        return None
+
+
+async def game_events(request, pk):
+    """
+    Streams the events of a game with Server-Sent Events. The first event is a
+    'game' event with the current board and winner. Then a 'move' event is sent
+    for every new move, and a 'game_over' event once the game has a winner,
+    after which the stream is closed. Must be served through the ASGI application.
+    """
+    user = await sync_to_async(authenticate)(request)
+    if not user or not user.is_authenticated:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=403
+        )
+
+    game = (
+        await Game.objects.using(get_shard_for_user(user.id))
+        .filter(player=user, pk=pk)
+        .afirst()
+    )
+    if not game:
+        raise Http404("No Game matches the given query.")
+
+    response = StreamingHttpResponse(
+        stream_game_events(game), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Keeps reverse proxies from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def stream_game_events(game):
+    # Subscribe before reading the game so no move is missed in between
+    subscription = broker.subscribe(game.id)
+    try:
+        await game.arefresh_from_db()
+        board = await sync_to_async(GameLogicService(game).get_current_board)()
+        yield format_event("game", {"board": board, "game_winner": game.game_winner})
+        if game.game_winner:
+            return
+
+        while True:
+            try:
+                name, data = await asyncio.wait_for(
+                    subscription.get(), timeout=KEEPALIVE_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            yield format_event(name, data)
+            if name == "game_over":
+                return
+    finally:
+        broker.unsubscribe(subscription)
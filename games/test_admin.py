@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from model_bakery import baker
+
+from games.admin import estimate_row_count
+from games.constants import PLAYER, COMPUTER
+from games.models import Game, Move
+from games.sharding import ID_OFFSET_BITS
+
+
+class AdminTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = get_user_model().objects.create_superuser(
+            username="admin", password="admin"
+        )
+        for _ in range(5):
+            game = baker.make(Game, player=baker.make(get_user_model()))
+            baker.make(
+                Move,
+                game=game,
+                move_by=PLAYER,
+                board_state=[[".", ".", "."], [".", "X", "."], [".", ".", "."]],
+            )
+            baker.make(
+                Move,
+                game=game,
+                move_by=COMPUTER,
+                board_state=[["O", ".", "."], [".", "X", "."], [".", ".", "."]],
+            )
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+
+    def test_game_changelist(self):
+        # Session, user, the game count estimate and the games with their boards
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("admin:games_game_changelist"))
+
+        assert response.status_code == 200
+        assert "O . .<br>. X .<br>. . ." in response.content.decode()
+
+    def test_game_changelist_filtered(self):
+        response = self.client.get(
+            reverse("admin:games_game_changelist"), {"game_winner__isnull": "True"}
+        )
+
+        assert response.status_code == 200
+        assert response.context["cl"].result_count == 5
+
+    def test_move_changelist(self):
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("admin:games_move_changelist"))
+
+        assert response.status_code == 200
+        assert response.context["cl"].result_count == Move.objects.latest("id").id
+
+    def test_estimate_row_count_with_shard_ids(self):
+        # Ids handed out by the first shard, after the games moved into it
+        for offset in range(1, 4):
+            baker.make(Game, id=(1 << ID_OFFSET_BITS) + offset, player=self.admin_user)
+
+        assert estimate_row_count(Game.objects.all()) == 8
@@ -0,0 +1,279 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import LiveServerTestCase, SimpleTestCase, TestCase, override_settings
+from django.core.servers.basehttp import WSGIServer
+from django.test.testcases import LiveServerThread
+from django.utils import timezone
+from model_bakery import baker
+
+from games.boards import get_position_key
+from games.constants import PLAYER, COMPUTER, TIE
+from games.loadtest import percentile
+from games.models import Game, Move
+from games.services import GameLogicService
+
+
+class GenerateLoadDataTestCase(TestCase):
+    def test_generates_legal_games(self):
+        call_command(
+            "generate_load_data",
+            users=5,
+            games_per_user=4,
+            batch_size=7,
+            users_per_transaction=2,
+            seed=1,
+            stdout=StringIO(),
+        )
+
+        assert (
+            get_user_model().objects.filter(username__startswith="loadtest-").count()
+            == 5
+        )
+        assert Game.objects.exists()
+
+        for game in Game.objects.all():
+            board = GameLogicService.get_initial_board()
+            moves = list(game.moves.order_by("created_at", "id"))
+            for ply, move in enumerate(moves):
+                assert move.move_by == (PLAYER if ply % 2 == 0 else COMPUTER)
+                changed = [
+                    (i, j)
+                    for i in range(3)
+                    for j in range(3)
+                    if move.board_state[i][j] != board[i][j]
+                ]
+                assert changed == [(move.x, move.y)]
+                assert move.ply == ply + 1
+                board = move.board_state
+
+            assert game.game_winner in (None, GameLogicService.get_board_winner(board))
+
+
+class AuditWinnersTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = baker.make(get_user_model())
+        won_board = [
+            ["X", "X", "X"],
+            ["O", "O", "."],
+            [".", ".", "."],
+        ]
+        cls.correct_game = baker.make(Game, player=user, game_winner=PLAYER)
+        baker.make(
+            Move,
+            game=cls.correct_game,
+            move_by=PLAYER,
+            board_state=won_board,
+            position_key=get_position_key(won_board),
+        )
+        # Missing position key, the board has to be read
+        cls.wrong_game = baker.make(Game, player=user, game_winner=None)
+        baker.make(Move, game=cls.wrong_game, move_by=PLAYER, board_state=won_board)
+        cls.empty_game = baker.make(Game, player=user, game_winner=COMPUTER)
+
+    def test_audit_does_not_repair(self):
+        out = StringIO()
+        call_command("audit_winners", batch_size=2, stdout=out)
+
+        assert "Checked 3 games" in out.getvalue()
+        assert "1 games stored as None should be player" in out.getvalue()
+        assert "1 games stored as computer should be None" in out.getvalue()
+        self.wrong_game.refresh_from_db()
+        assert self.wrong_game.game_winner is None
+
+    def test_audit_repair(self):
+        call_command("audit_winners", repair=True, stdout=StringIO())
+
+        self.wrong_game.refresh_from_db()
+        self.empty_game.refresh_from_db()
+        self.correct_game.refresh_from_db()
+        assert self.wrong_game.game_winner == PLAYER
+        assert self.empty_game.game_winner is None
+        assert self.correct_game.game_winner == PLAYER
+
+
+class BenchmarkSerializersTestCase(TestCase):
+    def test_benchmark_rolls_back(self):
+        out = StringIO()
+        call_command("benchmark_serializers", sizes=[1, 3], repeat=1, stdout=out)
+
+        assert "speedup" in out.getvalue()
+        assert not Game.objects.exists()
+
+
+class PruneGamesTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user1 = baker.make(get_user_model())
+        cls.user2 = baker.make(get_user_model())
+        long_ago = timezone.now() - timedelta(days=400)
+
+        cls.idle_game = baker.make(Game, player=cls.user1)
+        cls.old_finished_game = baker.make(Game, player=cls.user1, game_winner=TIE)
+        cls.recent_game = baker.make(Game, player=cls.user1)
+        # Created long ago but still being played
+        cls.active_game = baker.make(Game, player=cls.user1)
+
+        for game in [cls.idle_game, cls.old_finished_game, cls.active_game]:
+            baker.make(Move, game=game, move_by=PLAYER, board_state=[])
+        Game.objects.exclude(id=cls.recent_game.id).update(created_at=long_ago)
+        Move.objects.exclude(game=cls.active_game).update(created_at=long_ago)
+
+        cls.user2_games = [baker.make(Game, player=cls.user2) for _ in range(3)]
+
+    def test_prune_inactive_games(self):
+        out = StringIO()
+        call_command(
+            "prune_games", idle_days=30, finished_days=365, pause=0, stdout=out
+        )
+
+        assert "Deleted 2 games and 2 moves" in out.getvalue()
+        assert not Game.objects.filter(
+            id__in=[self.idle_game.id, self.old_finished_game.id]
+        ).exists()
+        assert (
+            Game.objects.filter(
+                id__in=[self.recent_game.id, self.active_game.id]
+            ).count()
+            == 2
+        )
+
+    def test_prune_dry_run(self):
+        call_command("prune_games", idle_days=30, dry_run=True, stdout=StringIO())
+
+        assert Game.objects.count() == 7
+
+    def test_prune_games_over_cap(self):
+        call_command(
+            "prune_games",
+            idle_days=None,
+            finished_days=None,
+            max_games_per_user=2,
+            batch_size=1,
+            pause=0,
+            stdout=StringIO(),
+        )
+
+        assert (
+            list(Game.objects.filter(player=self.user2).order_by("id"))
+            == self.user2_games[1:]
+        )
+        assert Game.objects.filter(player=self.user1).count() == 2
+
+
+class SingleThreadedWSGIServer(WSGIServer):
+    def __init__(self, *args, connections_override=None, **kwargs):
+        # Requests are handled in the server thread, which already uses the
+        # connections of the test
+        super().__init__(*args, **kwargs)
+
+
+class LiveServerSingleThread(LiveServerThread):
+    server_class = SingleThreadedWSGIServer
+
+
+@override_settings(GAMES_THROTTLE_RATES={"user": None, "move": None})
+class LoadTestTestCase(LiveServerTestCase):
+    host = "127.0.0.1"
+    # The threads of the threaded server share the connection to the in-memory
+    # test database, so they can't run transactions at the same time
+    server_thread_class = LiveServerSingleThread
+
+    def test_load_test(self):
+        out = StringIO()
+        call_command(
+            "loadtest",
+            users=3,
+            duration=1,
+            port=self.server_thread.port,
+            seed=1,
+            stdout=out,
+        )
+
+        output = out.getvalue()
+        assert "0 errors" in output
+        for endpoint in ("create", "move", "moves", "retrieve"):
+            assert f"\n{endpoint} " in output
+        assert Game.objects.filter(player__username__startswith="vu-").exists()
+
+
+class LoadTestHelpersTestCase(SimpleTestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile(values, 100) == 100
+        assert percentile([7], 95) == 7
+        assert percentile([], 50) == 0.0
+
+    def test_only_local_hosts(self):
+        with self.assertRaises(CommandError):
+            call_command("loadtest", host="example.com", stdout=StringIO())
+
+
+class VerifyHistoriesTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            "generate_load_data", users=3, games_per_user=4, seed=2, stdout=StringIO()
+        )
+        finished = Game.objects.filter(game_winner__isnull=False).order_by("id")
+        cls.wrong_winner = finished[0]
+        cls.wrong_winner.game_winner = (
+            TIE if cls.wrong_winner.game_winner != TIE else None
+        )
+        cls.wrong_winner.save()
+
+        cls.missing_columns = Move.objects.order_by("id")[3]
+        Move.objects.filter(id=cls.missing_columns.id).update(
+            ply=None, x=None, y=None, position_key=None
+        )
+
+        # Overwrites the computer's first move of a game with a second player token
+        cls.illegal_game = finished[1]
+        cls.illegal_move = cls.illegal_game.moves.get(ply=2)
+        cls.illegal_move.board_state = [
+            ["X" if token == "O" else token for token in row]
+            for row in cls.illegal_move.board_state
+        ]
+        cls.illegal_move.save()
+
+    def test_verify_does_not_repair(self):
+        out = StringIO()
+        call_command("verify_histories", workers=0, chunk_size=5, stdout=out)
+
+        output = out.getvalue()
+        assert f"Replayed {Game.objects.count()} games" in output
+        assert "1 winner_mismatch" in output
+        assert "wrong_token" in output
+        assert "1 unrepairable_games" in output
+        self.missing_columns.refresh_from_db()
+        assert self.missing_columns.ply is None
+
+    def test_verify_repair(self):
+        illegal_winner = self.illegal_game.game_winner
+        call_command(
+            "verify_histories", workers=1, chunk_size=5, repair=True, stdout=StringIO()
+        )
+
+        self.wrong_winner.refresh_from_db()
+        assert self.wrong_winner.game_winner == GameLogicService.get_board_winner(
+            self.wrong_winner.moves.latest("ply").board_state
+        )
+        self.missing_columns.refresh_from_db()
+        assert self.missing_columns.ply == 4
+        assert self.missing_columns.position_key == get_position_key(
+            self.missing_columns.board_state
+        )
+        # Illegal histories are only reported
+        self.illegal_game.refresh_from_db()
+        assert self.illegal_game.game_winner == illegal_winner
+
+        out = StringIO()
+        call_command("verify_histories", workers=0, stdout=out)
+        assert "winner_mismatch" not in out.getvalue()
@@ -0,0 +1,25 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from games.boards import BOARD_KEYS, decode_board
+from games.evaluator import get_winners, evaluate_boards, IN_PROGRESS, PLAYER_WON
+from games.services import GameLogicService
+
+
+class EvaluatorTestCase(SimpleTestCase):
+    def test_matches_game_logic_for_every_board(self):
+        keys = np.arange(BOARD_KEYS)
+        winners = get_winners(keys)
+
+        for key in keys:
+            board = decode_board(int(key))
+            assert winners[key] == GameLogicService.get_board_winner(board)
+
+    def test_evaluate_boards(self):
+        results = evaluate_boards([0, 1 + 3 + 9])
+
+        assert list(results) == [IN_PROGRESS, PLAYER_WON]
+
+    def test_invalid_keys(self):
+        with self.assertRaises(ValueError):
+            evaluate_boards([BOARD_KEYS])
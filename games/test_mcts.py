@@ -0,0 +1,80 @@
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from model_bakery import baker
+from rest_framework.test import APIClient
+
+from games.evaluator import COMPUTER_WON, PLAYER_WON, TIED
+from games.mcts import MonteCarloTreeSearch, run_playouts
+from games.models import Game
+
+
+class MonteCarloTreeSearchTestCase(SimpleTestCase):
+    def test_takes_winning_move(self):
+        search = MonteCarloTreeSearch(playouts=4000, seed=1)
+        move = search.choose_move(
+            [
+                ["O", "O", "."],
+                ["X", "X", "."],
+                ["X", ".", "."],
+            ]
+        )
+
+        assert move == (0, 2)
+        assert search.playouts_run >= 4000
+        assert search.playouts_per_second > 0
+
+    def test_blocks_player(self):
+        search = MonteCarloTreeSearch(playouts=4000, seed=1)
+        move = search.choose_move(
+            [
+                ["O", ".", "."],
+                ["X", "X", "."],
+                [".", ".", "."],
+            ]
+        )
+
+        assert move == (1, 2)
+
+    def test_game_over(self):
+        search = MonteCarloTreeSearch(playouts=100, seed=1)
+        with self.assertRaises(ValueError):
+            search.choose_move(
+                [
+                    ["X", "X", "X"],
+                    ["O", "O", "."],
+                    [".", ".", "."],
+                ]
+            )
+
+    def test_random_playouts(self):
+        results = run_playouts(
+            np.zeros(9, dtype=np.int8), 1, 100000, np.random.default_rng(0)
+        )
+        frequencies = np.bincount(results, minlength=4) / len(results)
+
+        # Known results of random play from the empty board
+        assert abs(frequencies[PLAYER_WON] - 0.585) < 0.01
+        assert abs(frequencies[COMPUTER_WON] - 0.288) < 0.01
+        assert abs(frequencies[TIED] - 0.127) < 0.01
+
+
+@override_settings(
+    GAMES_COMPUTER_OPPONENT="mcts", GAMES_MCTS_OPTIONS={"playouts": 1000, "seed": 1}
+)
+class MonteCarloTreeSearchOpponentTestCase(TestCase):
+    def test_computer_move(self):
+        user = baker.make(get_user_model())
+        game = baker.make(Game, player=user)
+        api_client = APIClient()
+        api_client.force_authenticate(user)
+
+        response = api_client.post(
+            reverse("games-move", kwargs={"pk": game.id}), data={"x": 1, "y": 1}
+        )
+
+        assert response.status_code == 200
+        board = response.json()["board"]
+        assert board[1][1] == "X"
+        assert sum(row.count("O") for row in board) == 1
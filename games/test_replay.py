@@ -0,0 +1,92 @@
+import json
+
+from django.test import SimpleTestCase
+
+from games.boards import get_position_key
+from games.constants import PLAYER, COMPUTER
+from games.replay import ReplayMove, replay_game
+
+BOARDS = [
+    [[".", ".", "."], [".", "X", "."], [".", ".", "."]],
+    [["O", ".", "."], [".", "X", "."], [".", ".", "."]],
+    [["O", "X", "."], [".", "X", "."], [".", ".", "."]],
+    [["O", "X", "."], [".", "X", "."], [".", ".", "O"]],
+    [["O", "X", "."], [".", "X", "."], [".", "X", "O"]],
+]
+COORDINATES = [(1, 1), (0, 0), (0, 1), (2, 2), (2, 1)]
+
+
+def make_moves(boards=BOARDS, coordinates=COORDINATES):
+    return [
+        ReplayMove(
+            id=ply,
+            move_by=PLAYER if ply % 2 else COMPUTER,
+            board_state=json.dumps(board),
+            ply=ply,
+            x=x,
+            y=y,
+            position_key=get_position_key(board),
+        )
+        for ply, (board, (x, y)) in enumerate(zip(boards, coordinates), start=1)
+    ]
+
+
+class ReplayTestCase(SimpleTestCase):
+    def test_legal_history(self):
+        replay = replay_game(1, PLAYER, make_moves())
+
+        assert replay.issues == []
+        assert replay.winner == PLAYER
+        assert replay.repairs == {}
+
+    def test_winner_mismatch(self):
+        replay = replay_game(1, None, make_moves())
+
+        assert [code for _, code, _ in replay.issues] == ["winner_mismatch"]
+
+    def test_two_tokens_placed(self):
+        moves = make_moves()
+        del moves[2]
+
+        replay = replay_game(1, PLAYER, moves)
+
+        assert (3, "illegal_move", "2 spaces changed, expected 1") in replay.issues
+
+    def test_wrong_turn_and_token(self):
+        moves = make_moves()
+        moves[1] = moves[1]._replace(
+            move_by=PLAYER, board_state=json.dumps(BOARDS[1]).replace("O", "X")
+        )
+
+        codes = [code for _, code, _ in replay_game(1, PLAYER, moves[:2]).issues]
+
+        assert codes == ["wrong_turn", "wrong_token", "winner_mismatch"]
+
+    def test_move_after_game_over(self):
+        moves = make_moves()
+        board = [["O", "X", "O"], [".", "X", "."], [".", "X", "O"]]
+        moves += make_moves([board], [(0, 2)])
+        moves[-1] = moves[-1]._replace(id=6, ply=6, move_by=COMPUTER)
+
+        replay = replay_game(1, PLAYER, moves)
+
+        assert [code for _, code, _ in replay.issues] == ["move_after_game_over"]
+
+    def test_invalid_board(self):
+        moves = make_moves()
+        moves[1] = moves[1]._replace(board_state='[["O", "."]]')
+
+        replay = replay_game(1, None, moves)
+
+        assert [code for _, code, _ in replay.issues] == ["invalid_board"]
+
+    def test_derived_columns(self):
+        moves = make_moves()
+        moves[0] = moves[0]._replace(ply=None, x=None, y=None, position_key=None)
+
+        replay = replay_game(1, PLAYER, moves)
+
+        assert replay.issues == []
+        assert replay.repairs == {
+            1: {"ply": 1, "x": 1, "y": 1, "position_key": get_position_key(BOARDS[0])}
+        }
@@ -0,0 +1,110 @@
+import datetime
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from model_bakery import baker
+from rest_framework.renderers import JSONRenderer
+
+from games.constants import PLAYER, COMPUTER
+from games.exceptions import MoveConflict
+from games.models import Game, Move
+from games.renderers import FastJSONRenderer
+from games.serializers import (
+    FastRetrieveGameSerializer,
+    MakeMoveSerializer,
+    RetrieveGameSerializer,
+)
+
+
+class FastRetrieveGameSerializerTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = baker.make(get_user_model())
+        cls.game_1 = baker.make(Game, player=cls.user)
+        cls.game_2 = baker.make(Game, player=cls.user, game_winner=PLAYER)
+        baker.make(Game, player=cls.user)
+
+        baker.make(
+            Move,
+            game=cls.game_1,
+            move_by=PLAYER,
+            board_state=[[".", ".", "."], [".", "X", "."], [".", ".", "."]],
+        )
+        baker.make(
+            Move,
+            game=cls.game_1,
+            move_by=COMPUTER,
+            board_state=[["O", ".", "."], [".", "X", "."], [".", ".", "."]],
+        )
+        baker.make(
+            Move,
+            game=cls.game_2,
+            move_by=PLAYER,
+            board_state=[["X", "X", "X"], ["O", "O", "."], [".", ".", "."]],
+        )
+
+    def test_same_payload_as_retrieve_serializer(self):
+        games = Game.objects.filter(player=self.user).order_by("created_at")
+
+        expected = JSONRenderer().render(RetrieveGameSerializer(games, many=True).data)
+        fast = FastJSONRenderer().render(
+            FastRetrieveGameSerializer(games.with_current_board(), many=True).data
+        )
+        # Without the annotation the board is read from the latest move
+        fast_without_annotation = FastJSONRenderer().render(
+            FastRetrieveGameSerializer(games, many=True).data
+        )
+
+        assert fast == expected
+        assert fast_without_annotation == expected
+
+    def test_single_query_for_list(self):
+        games = Game.objects.filter(player=self.user).with_current_board()
+
+        with self.assertNumQueries(1):
+            FastRetrieveGameSerializer(games, many=True).data
+
+
+class FastJSONRendererTestCase(TestCase):
+    def test_same_output_as_json_renderer(self):
+        for data in [
+            {"board": [["X", ".", "."]], "game_winner": None, "id": 1},
+            ["unicode ñ", "separators \u2028 \u2029"],
+            {"created_at": datetime.datetime(2024, 5, 4, 16, 5, 1, 123456)},
+            {"big": 2**70},
+        ]:
+            assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_without_orjson(self):
+        data = {"board": [["X", ".", "."]], "game_winner": None, "id": 1}
+
+        with patch("games.renderers.orjson", None):
+            assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indent(self):
+        data = {"id": 1}
+        media_type = "application/json; indent=4"
+
+        assert FastJSONRenderer().render(data, media_type) == JSONRenderer().render(
+            data, media_type
+        )
+
+
+class MakeMoveSerializerTestCase(TestCase):
+    def test_concurrent_moves(self):
+        game = baker.make(Game, player=baker.make(get_user_model()))
+        first = MakeMoveSerializer(data={"x": 0, "y": 0}, context={"game": game})
+        second = MakeMoveSerializer(data={"x": 2, "y": 2}, context={"game": game})
+        # Both requests read the empty board before either one moves
+        assert first.is_valid()
+        assert second.is_valid()
+
+        first.save()
+        with self.assertRaises(MoveConflict):
+            second.save()
+
+        assert list(game.moves.order_by("ply").values_list("ply", "move_by")) == [
+            (1, PLAYER),
+            (2, COMPUTER),
+        ]
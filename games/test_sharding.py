@@ -0,0 +1,149 @@
+from collections import Counter
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from model_bakery import baker
+from rest_framework.test import APIClient
+
+from games.constants import PLAYER
+from games.models import Game, Move
+from games.routers import GameShardRouter
+from games.sharding import get_shard_for_user, get_shards, is_sharded
+
+SHARDS = ["games_shard_0", "games_shard_1"]
+
+
+class ShardingTestCase(SimpleTestCase):
+    def test_unsharded(self):
+        assert get_shards() == ["default"]
+        assert not is_sharded()
+        assert get_shard_for_user(1) == "default"
+
+    @override_settings(GAMES_SHARDS=SHARDS)
+    def test_shard_for_user_is_stable_and_spread(self):
+        shards = Counter(get_shard_for_user(user_id) for user_id in range(1, 1001))
+
+        assert is_sharded()
+        assert set(shards) == set(SHARDS)
+        assert min(shards.values()) > 400
+        assert get_shard_for_user(42) == get_shard_for_user(42)
+
+
+@override_settings(GAMES_SHARDS=SHARDS)
+class GameShardRouterTestCase(SimpleTestCase):
+    def setUp(self):
+        self.router = GameShardRouter()
+        self.user = get_user_model()(pk=42)
+        self.shard = get_shard_for_user(42)
+
+    def test_unhinted_queries_use_default(self):
+        assert self.router.db_for_read(Game) is None
+        assert self.router.db_for_write(get_user_model(), instance=self.user) is None
+
+    def test_routes_by_player(self):
+        game = Game(player_id=42)
+
+        assert self.router.db_for_write(Game, instance=game) == self.shard
+        assert self.router.db_for_read(Game, instance=self.user) == self.shard
+
+    def test_routes_to_database_of_instance(self):
+        game = Game(player_id=42)
+        game._state.db = "games_shard_1"
+
+        assert self.router.db_for_read(Move, instance=game) == "games_shard_1"
+        # The player is read from the default database
+        assert self.router.db_for_read(get_user_model(), instance=game) == "default"
+
+    def test_allow_migrate(self):
+        assert self.router.allow_migrate("games_shard_0", "games") is True
+        assert self.router.allow_migrate("games_shard_0", "auth") is False
+        assert self.router.allow_migrate("default", "auth") is None
+        assert self.router.allow_migrate("default", "games") is None
+
+
+@override_settings(GAMES_SHARDS=SHARDS)
+class ShardedGamesTestCase(TestCase):
+    databases = {"default", *SHARDS}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = baker.make(get_user_model())
+        cls.shard = get_shard_for_user(cls.user.id)
+
+    def make_game(self, using):
+        game = Game.objects.using(using).create(player=self.user)
+        Move.objects.using(using).create(
+            game=game,
+            move_by=PLAYER,
+            ply=1,
+            x=1,
+            y=1,
+            board_state=[
+                [".", ".", "."],
+                [".", "X", "."],
+                [".", ".", "."],
+            ],
+        )
+        return game
+
+    def test_create_move_and_list(self):
+        api_client = APIClient()
+        api_client.force_authenticate(self.user)
+
+        response = api_client.post(reverse("games-list"))
+        game_id = response.json()["id"]
+        response = api_client.post(
+            reverse("games-move", kwargs={"pk": game_id}), data={"x": 1, "y": 1}
+        )
+
+        assert response.status_code == 200
+        assert Game.objects.using(self.shard).filter(id=game_id).exists()
+        assert Move.objects.using(self.shard).filter(game_id=game_id).count() == 2
+        assert not Game.objects.using("default").exists()
+        assert not Move.objects.using("default").exists()
+
+        response = api_client.get(reverse("games-list"))
+        assert [game["id"] for game in response.json()] == [game_id]
+
+    def test_delete_user_deletes_games(self):
+        self.make_game(self.shard)
+
+        self.user.delete()
+
+        assert not Game.objects.using(self.shard).exists()
+        assert not Move.objects.using(self.shard).exists()
+
+    def test_rebalance_from_default(self):
+        game = self.make_game("default")
+        out = StringIO()
+
+        call_command("rebalance_shards", stdout=out)
+
+        assert "Moved 1 games" in out.getvalue()
+        assert not Game.objects.using("default").exists()
+        assert not Move.objects.using("default").exists()
+        moved = Game.objects.using(self.shard).get(id=game.id)
+        assert moved.player_id == self.user.id
+        assert moved.created_at == game.created_at
+        assert moved.moves.get().board_state[1][1] == "X"
+
+    def test_rebalance_from_retired_shard(self):
+        game = self.make_game("games_shard_1")
+
+        with self.settings(GAMES_SHARDS=["games_shard_0"]):
+            call_command("rebalance_shards", stdout=StringIO())
+            assert Game.objects.using("games_shard_1").filter(id=game.id).exists()
+
+            call_command(
+                "rebalance_shards", from_db=["games_shard_1"], stdout=StringIO()
+            )
+
+        assert not Game.objects.using("games_shard_1").exists()
+        assert Move.objects.using("games_shard_0").filter(game_id=game.id).exists()
+
+    def test_rebalance_unknown_database(self):
+        with self.assertRaises(CommandError):
+            call_command("rebalance_shards", from_db=["missing"], stdout=StringIO())
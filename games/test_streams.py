@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from unittest.mock import patch
+from model_bakery import baker
+
+from games.constants import PLAYER
+from games.events import broker, format_event
+from games.models import Game, Move
+
+
+class GameEventsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user1 = baker.make(get_user_model(), username="user1")
+        cls.user2 = baker.make(get_user_model(), username="user2")
+        cls.game = baker.make(Game, player=cls.user1)
+        cls.finished_game = baker.make(Game, player=cls.user1, game_winner=PLAYER)
+        cls.board = [
+            [".", ".", "."],
+            [".", "X", "."],
+            [".", ".", "."],
+        ]
+        baker.make(Move, game=cls.finished_game, move_by=PLAYER, board_state=cls.board)
+
+    async def test_events_unauthenticated(self):
+        response = await self.async_client.get(
+            reverse("games-events", kwargs={"pk": self.game.id})
+        )
+
+        assert response.status_code == 403
+
+    async def test_events_game_does_not_belong_to_user(self):
+        await self.async_client.aforce_login(self.user2)
+        response = await self.async_client.get(
+            reverse("games-events", kwargs={"pk": self.game.id})
+        )
+
+        assert response.status_code == 404
+
+    async def test_events_finished_game(self):
+        await self.async_client.aforce_login(self.user1)
+        response = await self.async_client.get(
+            reverse("games-events", kwargs={"pk": self.finished_game.id})
+        )
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/event-stream"
+        # The stream is closed right after the current state of the game
+        chunks = [chunk async for chunk in response.streaming_content]
+        assert b"".join(chunks).decode() == format_event(
+            "game", {"board": self.board, "game_winner": PLAYER}
+        )
+
+    async def test_events_stream_moves(self):
+        await self.async_client.aforce_login(self.user1)
+        response = await self.async_client.get(
+            reverse("games-events", kwargs={"pk": self.game.id})
+        )
+        stream = aiter(response.streaming_content)
+
+        first_event = await anext(stream)
+        assert b"event: game\n" in first_event
+        assert broker.subscriber_count(self.game.id) == 1
+
+        move_data = {"move_by": PLAYER, "board": self.board, "game_winner": PLAYER}
+        broker.publish(self.game.id, "move", move_data)
+        broker.publish(self.game.id, "game_over", {"game_winner": PLAYER})
+
+        assert (await anext(stream)).decode() == format_event("move", move_data)
+        assert (await anext(stream)).decode() == format_event(
+            "game_over", {"game_winner": PLAYER}
+        )
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+        assert broker.subscriber_count(self.game.id) == 0
+
+    @patch("games.services.randint")
+    @patch("games.events.broker.publish")
+    def test_moves_are_published_on_commit(self, publish_mock, randint_mock):
+        randint_mock.return_value = 0
+        api_client = APIClient()
+        api_client.force_authenticate(self.user1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = api_client.post(
+                reverse("games-move", kwargs={"pk": self.game.id}),
+                data={"x": 1, "y": 1},
+            )
+
+        assert response.status_code == 200
+        assert [call.args[1] for call in publish_mock.call_args_list] == [
+            "move",
+            "move",
+        ]
+        assert publish_mock.call_args_list[0].args[2]["board"] == [
+            [".", ".", "."],
+            [".", "X", "."],
+            [".", ".", "."],
+        ]
+        assert (
+            publish_mock.call_args_list[1].args[2]["board"] == response.json()["board"]
+        )
@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from model_bakery import baker
+from rest_framework.test import APIClient
+
+from games.models import Game
+from games.throttling import TokenBucketRegistry, parse_rate, registry
+
+
+class TokenBucketRegistryTestCase(SimpleTestCase):
+    def test_parse_rate(self):
+        assert parse_rate("20/s") == (20, 20)
+        assert parse_rate("120/min") == (120, 2)
+        with self.assertRaises(ImproperlyConfigured):
+            parse_rate("20 per second")
+        with self.assertRaises(ImproperlyConfigured):
+            parse_rate("0/s")
+        with self.assertRaises(ImproperlyConfigured):
+            parse_rate("0/min")
+
+    def test_consume(self):
+        buckets = TokenBucketRegistry()
+
+        assert buckets.consume("move", 1, 2, 1, now=0) == 0
+        assert buckets.consume("move", 1, 2, 1, now=0) == 0
+        assert buckets.consume("move", 1, 2, 1, now=0.25) == 0.75
+        # Other clients and scopes have their own buckets
+        assert buckets.consume("move", 2, 2, 1, now=0.25) == 0
+        assert buckets.consume("user", 1, 2, 1, now=0.25) == 0
+        # Refilled
+        assert buckets.consume("move", 1, 2, 1, now=1) == 0
+
+        assert buckets.get_stats() == {
+            "scopes": {
+                "move": {"allowed": 4, "throttled": 1},
+                "user": {"allowed": 1, "throttled": 0},
+            },
+            "buckets": 3,
+        }
+
+    def test_least_recently_used_buckets_are_dropped(self):
+        buckets = TokenBucketRegistry(max_buckets=2)
+        buckets.consume("move", 1, 1, 1, now=0)
+        buckets.consume("move", 2, 1, 1, now=0)
+        buckets.consume("move", 3, 1, 1, now=0)
+
+        assert buckets.get_stats()["buckets"] == 2
+        # Starts again with a full bucket
+        assert buckets.consume("move", 1, 1, 1, now=0) == 0
+
+
+@override_settings(GAMES_THROTTLE_RATES={"move": "2/min"})
+class ThrottlingTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = baker.make(get_user_model(), username="user1")
+        cls.admin = baker.make(get_user_model(), username="admin", is_staff=True)
+
+    def setUp(self):
+        registry.reset()
+        self.addCleanup(registry.reset)
+        self.api_client = APIClient()
+
+    def test_throttles_moves(self):
+        self.api_client.force_authenticate(self.user)
+        game = baker.make(Game, player=self.user)
+        url = reverse("games-move", kwargs={"pk": game.id})
+
+        responses = [self.api_client.post(url, data={"x": x, "y": 0}) for x in range(3)]
+
+        assert all(response.status_code != 429 for response in responses[:2])
+        assert responses[2].status_code == 429
+        assert 1 <= int(responses[2]["Retry-After"]) <= 30
+        # Other endpoints aren't affected
+        assert self.api_client.get(reverse("games-list")).status_code == 200
+
+    def test_stats(self):
+        self.api_client.force_authenticate(self.user)
+        self.api_client.get(reverse("games-list"))
+        assert self.api_client.get(reverse("throttling-stats")).status_code == 403
+
+        self.api_client.force_authenticate(self.admin)
+        response = self.api_client.get(reverse("throttling-stats"))
+
+        assert response.status_code == 200
+        assert response.json()["scopes"]["user"] == {"allowed": 1, "throttled": 0}
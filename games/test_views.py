@@ -5,7 +5,8 @@ from rest_framework.test import APIClient
 from unittest.mock import patch
 from model_bakery import baker
 
-from games.constants import PLAYER, COMPUTER
+from games.boards import get_position_key
+from games.constants import PLAYER, COMPUTER, TIE
 from games.models import Game, Move
 
 
@@ -21,6 +22,9 @@ class GamesViewSetTestCase(TestCase):
 
         cls.move1_game1 = baker.make(
             Move,
+            ply=1,
+            x=1,
+            y=1,
             move_by=PLAYER,
             game=cls.game_1,
             board_state=[
@@ -31,6 +35,9 @@ class GamesViewSetTestCase(TestCase):
         )
         cls.move2_game1 = baker.make(
             Move,
+            ply=2,
+            x=0,
+            y=0,
             move_by=COMPUTER,
             game=cls.game_1,
             board_state=[
@@ -41,6 +48,9 @@ class GamesViewSetTestCase(TestCase):
         )
         cls.move3_game1 = baker.make(
             Move,
+            ply=3,
+            x=0,
+            y=1,
             move_by=PLAYER,
             game=cls.game_1,
             board_state=[
@@ -51,6 +61,9 @@ class GamesViewSetTestCase(TestCase):
         )
         cls.move4_game1 = baker.make(
             Move,
+            ply=4,
+            x=1,
+            y=2,
             move_by=COMPUTER,
             game=cls.game_1,
             board_state=[
@@ -116,6 +129,26 @@ class GamesViewSetTestCase(TestCase):
             },
         ]
 
+    def test_lists_user_games_paginated(self):
+        self.api_client.force_authenticate(self.user1)
+        response = self.api_client.get(reverse("games-list"), {"page_size": 1})
+
+        assert response.status_code == 200
+        assert [game["id"] for game in response.json()] == [self.game_1.id]
+
+        next_link = response["Link"].split(">")[0].lstrip("<")
+        response = self.api_client.get(next_link)
+
+        assert response.status_code == 200
+        assert [game["id"] for game in response.json()] == [self.game_2.id]
+        assert "Link" not in response
+
+    def test_lists_user_games_invalid_cursor(self):
+        self.api_client.force_authenticate(self.user1)
+        response = self.api_client.get(reverse("games-list"), {"cursor": "invalid"})
+
+        assert response.status_code == 404
+
     def test_create_game_unauthenticated(self):
         response = self.api_client.post(reverse("games-list"))
 
@@ -172,6 +205,67 @@ class GamesViewSetTestCase(TestCase):
             ],
         ]
 
+    def test_get_game_moves_paginated(self):
+        self.api_client.force_authenticate(self.user1)
+        url = reverse("games-moves", kwargs={"pk": self.game_1.id})
+        boards = []
+        pages = 0
+        while url:
+            response = self.api_client.get(url, {"page_size": 3} if not pages else {})
+            assert response.status_code == 200
+            boards += response.json()
+            pages += 1
+            url = response.get("Link", "").split(">")[0].lstrip("<")
+
+        assert pages == 2
+        assert boards == [
+            move.board_state
+            for move in [
+                self.move1_game1,
+                self.move2_game1,
+                self.move3_game1,
+                self.move4_game1,
+            ]
+        ]
+
+    def test_get_game_moves_since(self):
+        self.api_client.force_authenticate(self.user1)
+        response = self.api_client.get(
+            reverse("games-moves", kwargs={"pk": self.game_1.id}), {"since": 2}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"ply": 3, "x": 0, "y": 1, "by": PLAYER},
+            {"ply": 4, "x": 1, "y": 2, "by": COMPUTER},
+        ]
+
+    @patch("games.services.randint")
+    def test_get_game_moves_since_after_move(self, randint_mock):
+        # mock randint to return 3, which means position (2,2)
+        randint_mock.return_value = 3
+        self.api_client.force_authenticate(self.user1)
+        self.api_client.post(
+            reverse("games-move", kwargs={"pk": self.game_1.id}), data={"x": 1, "y": 0}
+        )
+        response = self.api_client.get(
+            reverse("games-moves", kwargs={"pk": self.game_1.id}), {"since": 4}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"ply": 5, "x": 1, "y": 0, "by": PLAYER},
+            {"ply": 6, "x": 2, "y": 2, "by": COMPUTER},
+        ]
+
+    def test_get_game_moves_invalid_since(self):
+        self.api_client.force_authenticate(self.user1)
+        response = self.api_client.get(
+            reverse("games-moves", kwargs={"pk": self.game_1.id}), {"since": -1}
+        )
+
+        assert response.status_code == 400
+
     def test_get_game_moves_does_not_belong_to_user(self):
         self.api_client.force_authenticate(self.user2)
         response = self.api_client.get(
@@ -227,6 +321,34 @@ class GamesViewSetTestCase(TestCase):
             "game_winner": "player",
         }
 
+    def test_make_game_concurrent_move(self):
+        # Another request makes the 5th move after this one read the board
+        baker.make(
+            Move,
+            ply=5,
+            x=2,
+            y=0,
+            move_by=PLAYER,
+            game=self.game_1,
+            board_state=[
+                ["O", "X", "."],
+                [".", "X", "O"],
+                ["X", ".", "."],
+            ],
+        )
+        self.api_client.force_authenticate(self.user1)
+        with patch(
+            "games.services.GameLogicService.get_current_board",
+            return_value=self.move4_game1.board_state,
+        ):
+            response = self.api_client.post(
+                reverse("games-move", kwargs={"pk": self.game_1.id}),
+                data={"x": 1, "y": 0},
+            )
+
+        assert response.status_code == 409
+        assert self.game_1.moves.count() == 5
+
     @patch("games.services.randint")
     def test_make_game_winning_move_computer(self, randint_mock):
         baker.make(
@@ -324,3 +446,79 @@ class GamesViewSetTestCase(TestCase):
             ],
             "game_winner": "tie",
         }
+
+
+class PositionsViewSetTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = baker.make(get_user_model(), username="user1")
+
+        board = [
+            ["X", ".", "."],
+            [".", "O", "."],
+            [".", ".", "."],
+        ]
+        # Same position as the board above, rotated 90 degrees
+        rotated_board = [
+            [".", ".", "X"],
+            [".", "O", "."],
+            [".", ".", "."],
+        ]
+        other_board = [
+            [".", "X", "."],
+            [".", "O", "."],
+            [".", ".", "."],
+        ]
+
+        for winner, board_state in [
+            (PLAYER, board),
+            (TIE, rotated_board),
+            (None, board),
+            (PLAYER, other_board),
+        ]:
+            game = baker.make(Game, player=cls.user, game_winner=winner)
+            baker.make(
+                Move,
+                move_by=COMPUTER,
+                game=game,
+                board_state=board_state,
+                position_key=get_position_key(board_state),
+            )
+
+    def setUp(self):
+        self.api_client = APIClient()
+
+    def test_position_unauthenticated(self):
+        response = self.api_client.get(
+            reverse("positions-detail", kwargs={"board": "X...O...."})
+        )
+
+        assert response.status_code == 403
+
+    def test_position_stats(self):
+        self.api_client.force_authenticate(self.user)
+        response = self.api_client.get(
+            reverse("positions-detail", kwargs={"board": "..X.O...."})
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "position_key": get_position_key(
+                [["X", ".", "."], [".", "O", "."], [".", ".", "."]]
+            ),
+            "board": [
+                ["X", ".", "."],
+                [".", "O", "."],
+                [".", ".", "."],
+            ],
+            "occurrences": 3,
+            "outcomes": {"player": 1, "computer": 0, "tie": 1, "in_progress": 1},
+        }
+
+    def test_position_invalid_board(self):
+        self.api_client.force_authenticate(self.user)
+        response = self.api_client.get(
+            reverse("positions-detail", kwargs={"board": "X...A...."})
+        )
+
+        assert response.status_code == 400
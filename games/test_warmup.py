@@ -0,0 +1,43 @@
+import asyncio
+
+from django.test import TestCase, override_settings
+
+from games.boards import get_canonical_key
+from games.warmup import summarize_import_times, warm_up
+
+
+class WarmupTestCase(TestCase):
+    def test_warm_up(self):
+        get_canonical_key.cache_clear()
+
+        timings = warm_up()
+
+        steps = [step for step, _, _ in timings]
+        assert steps[0] == "import tictactoe.urls"
+        assert "synthetic request" in steps
+        assert "connect default" in steps
+        assert steps[-1] == "close connections"
+        assert all(error is None for _, _, error in timings)
+        assert get_canonical_key.cache_info().currsize > 0
+
+    def test_warm_up_from_event_loop(self):
+        async def start_worker():
+            return warm_up()
+
+        timings = asyncio.run(start_worker())
+
+        assert all(error is None for _, _, error in timings)
+
+    @override_settings(GAMES_WARMUP=False)
+    def test_disabled(self):
+        assert warm_up() == []
+
+    def test_summarize_import_times(self):
+        lines = [
+            "import time: self [us] | cumulative | imported package",
+            "import time:      1000 |       1000 |     django.utils",
+            "import time:      2000 |       3000 |   django",
+            "import time:       500 |       3500 | games.views",
+        ]
+
+        assert summarize_import_times(lines) == [("django", 0.003), ("games", 0.0005)]
@@ -0,0 +1,201 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from model_bakery import baker
+from rest_framework.test import APIClient
+
+from games.constants import PLAYER, COMPUTER
+from games.exceptions import MoveConflict
+from games.models import Game, Move
+from games.services import GameLogicService
+from games.write_behind import store
+
+# Flushes are triggered by the tests, the background thread never gets to run
+WRITE_BEHIND = {"ENABLED": True, "FLUSH_INTERVAL": 3600}
+
+
+@override_settings(GAMES_WRITE_BEHIND=WRITE_BEHIND)
+class WriteBehindTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = baker.make(get_user_model(), username="user1")
+        cls.game = baker.make(Game, player=cls.user)
+        baker.make(
+            Move,
+            ply=1,
+            x=1,
+            y=1,
+            move_by=PLAYER,
+            game=cls.game,
+            board_state=[[".", ".", "."], [".", "X", "."], [".", ".", "."]],
+        )
+        baker.make(
+            Move,
+            ply=2,
+            x=0,
+            y=0,
+            move_by=COMPUTER,
+            game=cls.game,
+            board_state=[["O", ".", "."], [".", "X", "."], [".", ".", "."]],
+        )
+
+    def setUp(self):
+        self.api_client = APIClient()
+        self.api_client.force_authenticate(self.user)
+        self.addCleanup(store.clear)
+
+    def move(self, x, y):
+        return self.api_client.post(
+            reverse("games-move", kwargs={"pk": self.game.id}), data={"x": x, "y": y}
+        )
+
+    @patch("games.services.randint")
+    def test_moves_are_written_later(self, randint_mock):
+        # Position (2, 2)
+        randint_mock.return_value = 5
+        response = self.move(0, 1)
+
+        assert response.status_code == 200
+        board = [["O", "X", "."], [".", "X", "."], [".", ".", "O"]]
+        assert response.json() == {"board": board, "game_winner": None}
+        assert self.game.moves.count() == 2
+
+        # Reads see the moves before they're written
+        response = self.api_client.get(
+            reverse("games-detail", kwargs={"pk": self.game.id})
+        )
+        assert response.json()["board"] == board
+
+        assert store.flush() == 2
+        assert list(self.game.moves.order_by("ply").values_list("ply", "x", "y")) == [
+            (1, 1, 1),
+            (2, 0, 0),
+            (3, 0, 1),
+            (4, 2, 2),
+        ]
+
+    @patch("games.services.randint")
+    def test_history_reads_flush(self, randint_mock):
+        randint_mock.return_value = 5
+        self.move(0, 1)
+
+        response = self.api_client.get(
+            reverse("games-moves", kwargs={"pk": self.game.id}), {"since": 2}
+        )
+
+        assert [move["ply"] for move in response.json()] == [3, 4]
+        assert not store.has_pending(self.game.id)
+
+    def test_flush_game_only_writes_the_game(self):
+        other_game = baker.make(Game, player=self.user)
+        board = [[".", ".", "."], [".", "X", "."], [".", ".", "."]]
+        store.add(
+            Move(game=other_game, move_by=PLAYER, board_state=board, ply=1),
+            using="default",
+        )
+        store.add(
+            Move(
+                game=self.game,
+                move_by=PLAYER,
+                board_state=[["O", "X", "."], [".", "X", "."], [".", ".", "."]],
+                ply=3,
+            ),
+            using="default",
+        )
+
+        assert store.flush_game(self.game.id) == 1
+
+        assert self.game.moves.count() == 3
+        assert not other_game.moves.exists()
+        assert store.has_pending(other_game.id)
+        assert store.flush() == 1
+
+    @patch("games.services.randint")
+    def test_final_move_is_written_synchronously(self, randint_mock):
+        randint_mock.return_value = 5
+        self.move(0, 1)
+
+        response = self.move(2, 1)
+
+        assert response.json()["game_winner"] == PLAYER
+        assert self.game.moves.count() == 5
+        self.game.refresh_from_db()
+        assert self.game.game_winner == PLAYER
+        assert store.get_board(self.game.id) is None
+
+    def test_conflicting_moves_are_dropped(self):
+        board = [["O", "X", "."], [".", "X", "."], [".", ".", "."]]
+        store.add(
+            Move(game=self.game, move_by=PLAYER, board_state=board, ply=3),
+            using="default",
+        )
+        store.add(
+            Move(game=self.game, move_by=COMPUTER, board_state=board, ply=4),
+            using="default",
+        )
+        # Another process already wrote this ply
+        baker.make(Move, game=self.game, move_by=PLAYER, board_state=board, ply=3)
+
+        with self.assertLogs("games.write_behind", level="ERROR"):
+            assert store.flush() == 1
+
+        assert self.game.moves.count() == 4
+
+    @override_settings(GAMES_WRITE_BEHIND={**WRITE_BEHIND, "MAX_PENDING": 2})
+    @patch("games.services.randint")
+    def test_max_pending_flushes(self, randint_mock):
+        randint_mock.return_value = 5
+        # Once the request's transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.move(0, 1)
+
+        assert self.game.moves.count() == 4
+
+    @patch("games.services.randint")
+    def test_concurrent_moves_conflict(self, randint_mock):
+        randint_mock.return_value = 5
+        first = GameLogicService(self.game)
+        second = GameLogicService(self.game)
+        # Both requests read the board before either one moves
+        first.get_current_board()
+        second.get_current_board()
+
+        first.make_player_move(0, 1)
+        with self.assertRaises(MoveConflict):
+            second.make_player_move(2, 0)
+
+        assert store.get_board(self.game.id) == [
+            ["O", "X", "."],
+            [".", "X", "."],
+            [".", ".", "."],
+        ]
+        assert store.flush() == 1
+
+    @patch("games.services.randint")
+    def test_conflict_keeps_acknowledged_moves(self, randint_mock):
+        randint_mock.return_value = 5
+        self.move(0, 1)
+        # Another process wrote the 5th move
+        baker.make(
+            Move,
+            ply=5,
+            x=2,
+            y=1,
+            move_by=PLAYER,
+            game=self.game,
+            board_state=[["O", "X", "."], [".", "X", "."], [".", "X", "O"]],
+        )
+
+        response = self.move(2, 1)
+
+        assert response.status_code == 409
+        assert not store.has_pending(self.game.id)
+        assert list(self.game.moves.order_by("ply").values_list("ply", flat=True)) == [
+            1,
+            2,
+            3,
+            4,
+            5,
+        ]
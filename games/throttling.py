@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.throttling import BaseThrottle
+
+DEFAULT_THROTTLE_RATES = {
+    # Every request of a user to the games endpoints
+    "user": "60/s",
+    # Moves of a user, far more than a person can make
+    "move": "20/s",
+}
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def get_rates():
+    return {**DEFAULT_THROTTLE_RATES, **getattr(settings, "GAMES_THROTTLE_RATES", {})}
+
+
+def parse_rate(rate):
+    """
+    Parses a rate in the REST framework format, e.g. '20/s' or '100/min', into
+    the bucket capacity and the tokens added per second. A client can make
+    a burst of as many requests as the rate allows in one period. Rates must
+    allow at least one request, scopes set to None aren't throttled.
+    """
+    try:
+        count, period = rate.split("/")
+        capacity = int(count)
+        duration = PERIODS[period[0]]
+    except (KeyError, IndexError, ValueError):
+        raise ImproperlyConfigured(f"Invalid throttle rate: {rate!r}")
+    if capacity < 1:
+        # An empty bucket never refills
+        raise ImproperlyConfigured(
+            f"Invalid throttle rate: {rate!r}, it must allow at least one request"
+        )
+    return capacity, capacity / duration
+
+
+class TokenBucketRegistry:
+    """
+    In-process token buckets, one per scope and client. A bucket holds up to
+    capacity tokens and refills at a constant rate, and every request takes one
+    token. Checks are O(1) and never touch the database or the cache, but the
+    limits apply per process.
+
+    The least recently used buckets are dropped once there are more than
+    max_buckets of them, the clients they belonged to start with a full bucket.
+    """
+
+    def __init__(self, max_buckets=100000):
+        self.max_buckets = max_buckets
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = defaultdict(lambda: {"allowed": 0, "throttled": 0})
+
+    def consume(self, scope, ident, capacity, refill_rate, now=None):
+        """
+        Takes a token from the bucket of the client in the given scope. Returns
+        0 if the request is allowed, or else the seconds until a token is available.
+        """
+        if now is None:
+            now = time.monotonic()
+        key = (scope, ident)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                # Buckets are [tokens, last refill time]
+                bucket = self._buckets[key] = [capacity, now]
+                if len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                self._counters[scope]["allowed"] += 1
+                return 0
+            self._counters[scope]["throttled"] += 1
+            return (1 - bucket[0]) / refill_rate
+
+    def get_stats(self):
+        """
+        Returns the allowed and throttled requests of every scope since the
+        process started, and the number of buckets in memory.
+        """
+        with self._lock:
+            return {
+                "scopes": {
+                    scope: dict(counts) for scope, counts in self._counters.items()
+                },
+                "buckets": len(self._buckets),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+            self._counters.clear()
+
+
+registry = TokenBucketRegistry(getattr(settings, "GAMES_THROTTLE_MAX_BUCKETS", 100000))
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttles the requests of each user, or each IP address for anonymous
+    requests, with the token buckets of the registry. Rates are read from the
+    GAMES_THROTTLE_RATES setting by scope, scopes without a rate aren't throttled.
+    """
+
+    scope = None
+
+    def get_scope(self, request, view):
+        return self.scope
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        rate = get_rates().get(scope)
+        if rate is None:
+            return True
+
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        self.retry_after = registry.consume(scope, ident, *parse_rate(rate))
+        return not self.retry_after
+
+    def wait(self):
+        return self.retry_after
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    scope = "user"
+
+
+class ActionTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Throttles every action of a viewset separately, using the action name
+    (e.g. 'move') as the scope.
+    """
+
+    def get_scope(self, request, view):
+        return getattr(view, "action", None)
@@ -1,12 +1,16 @@
 from django.urls import path, include
 from rest_framework import routers
 
-from games.views import GamesViewSet
+from games.streams import game_events
+from games.views import GamesViewSet, PositionsViewSet, ThrottlingStatsView
 
 router = routers.DefaultRouter()
 router.register(r"games", GamesViewSet, basename="games")
+router.register(r"positions", PositionsViewSet, basename="positions")
 
 urlpatterns = [
+    path("games/<int:pk>/events/", game_events, name="games-events"),
+    path("throttling/", ThrottlingStatsView.as_view(), name="throttling-stats"),
     path("", include(router.urls)),
     path("auth/", include("rest_framework.urls", namespace="rest_framework")),
 ]
@@ -1,19 +1,42 @@
 # Django / DRF imports
+from django.db.models import Count
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import NotAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 # Project imports
-from games.models import Game
+from games import write_behind
+from games.boards import decode_board, get_position_key
+from games.constants import WINNER_CHOICES
+from games.models import Game, Move
+from games.pagination import KeysetPagination
+from games.renderers import FastJSONRenderer
 from games.serializers import (
     CreateGameSerializer,
+    FastRetrieveGameSerializer,
     MakeMoveSerializer,
+    MoveDeltaSerializer,
+    MovesSinceSerializer,
+    PositionSerializer,
     RetrieveGameSerializer,
 )
+from games.sharding import get_shard_for_user, get_shards
+from games.throttling import (
+    ActionTokenBucketThrottle,
+    UserTokenBucketThrottle,
+    registry,
+)
 
 
 class GamesViewSet(viewsets.ModelViewSet):
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    pagination_class = KeysetPagination
+    throttle_classes = [UserTokenBucketThrottle, ActionTokenBucketThrottle]
+
     def perform_authentication(self, request):
         current_user = self.request.user
         if not current_user or not current_user.id:
@@ -22,7 +45,15 @@ class GamesViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         current_user = self.request.user
-        return Game.objects.filter(player=current_user).order_by("created_at")
+        queryset = (
+            Game.objects.using(get_shard_for_user(current_user.id))
+            .filter(player=current_user)
+            .order_by("created_at")
+        )
+        if self.action in ("list", "retrieve"):
+            # Boards are read in the same query as the games
+            queryset = queryset.with_current_board()
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "move":
@@ -31,6 +62,9 @@ class GamesViewSet(viewsets.ModelViewSet):
         if self.action == "create":
             return CreateGameSerializer
 
+        if self.action in ("list", "retrieve"):
+            return FastRetrieveGameSerializer
+
         return RetrieveGameSerializer
 
     @action(detail=True, methods=["post"])
@@ -49,7 +83,79 @@ class GamesViewSet(viewsets.ModelViewSet):
         )
 
     @action(detail=True, methods=["get"])
-    def moves(self, *args, **kwargs):
+    def moves(self, request, *args, **kwargs):
         game = self.get_object()
-        moves = game.moves.order_by("created_at")
-        return Response([move.board_state for move in moves], status=status.HTTP_200_OK)
+        if write_behind.is_enabled():
+            # The history is read from the database
+            write_behind.store.flush_game(game.id)
+
+        if "since" in request.query_params:
+            # Compact deltas of the moves after the given ply, read from the
+            # (game, ply) index. A game has at most 9 moves so there's no pagination.
+            query_serializer = MovesSinceSerializer(data=request.query_params)
+            query_serializer.is_valid(raise_exception=True)
+            moves = game.moves.filter(
+                ply__gt=query_serializer.validated_data["since"]
+            ).order_by("ply")
+            return Response(
+                MoveDeltaSerializer(moves, many=True).data, status=status.HTTP_200_OK
+            )
+
+        moves = self.paginate_queryset(game.moves.all())
+        return self.get_paginated_response([move.board_state for move in moves])
+
+
+class PositionsViewSet(viewsets.ViewSet):
+    """
+    Statistics about a board position across all games. Positions are given as
+    9 characters read row by row, e.g. 'X...O....', and boards that are
+    rotations or mirror images of each other count as the same position.
+    """
+
+    permission_classes = [IsAuthenticated]
+    lookup_field = "board"
+    lookup_value_regex = "[^/]+"
+
+    def retrieve(self, request, board=None):
+        serializer = PositionSerializer(data={"board": board})
+        serializer.is_valid(raise_exception=True)
+        position_key = get_position_key(serializer.validated_data["board"])
+
+        # Every game goes through a position at most once, so counting moves
+        # counts the games that reached it. Uses the index on position_key,
+        # with one lookup per shard.
+        outcomes = {winner: 0 for winner in [*WINNER_CHOICES, None]}
+        for shard in get_shards():
+            rows = (
+                Move.objects.using(shard)
+                .filter(position_key=position_key)
+                .values("game__game_winner")
+                .annotate(count=Count("id"))
+                .order_by()
+            )
+            for row in rows:
+                outcomes[row["game__game_winner"]] += row["count"]
+
+        return Response(
+            {
+                "position_key": position_key,
+                "board": decode_board(position_key),
+                "occurrences": sum(outcomes.values()),
+                "outcomes": {
+                    **{winner: outcomes[winner] for winner in WINNER_CHOICES},
+                    "in_progress": outcomes[None],
+                },
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class ThrottlingStatsView(APIView):
+    """
+    Requests allowed and throttled by scope since this process started.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(registry.get_stats(), status=status.HTTP_200_OK)
@@ -0,0 +1,159 @@
+import asyncio
+import importlib
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.urls import get_resolver, reverse
+
+from games.sharding import get_shards
+
+logger = logging.getLogger(__name__)
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+\d+ \|\s+(\S+)")
+
+# Timings of the latest warmup, as (step, seconds, error) tuples
+timings = []
+
+
+def warm_up():
+    """
+    Pays the cold start costs of a worker before it accepts traffic: imports
+    the modules loaded by the first request, fills the game logic caches,
+    builds the URL resolver and serializer fields, handles one synthetic
+    request and checks that every database can be reached. Steps that fail are
+    logged and skipped, warming up never stops a worker from starting.
+
+    The database connections are closed at the end. Servers that load the
+    application before forking (e.g. gunicorn --preload) would otherwise hand
+    the same SQLite connections to every worker, which SQLite doesn't allow.
+
+    Disabled by setting GAMES_WARMUP to False. Returns the timings.
+    """
+    if not getattr(settings, "GAMES_WARMUP", True):
+        return []
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        run_steps()
+    else:
+        # Database access isn't allowed from the event loop of ASGI servers
+        thread = threading.Thread(target=run_steps, name="warmup")
+        thread.start()
+        thread.join()
+    return timings
+
+
+def run_steps():
+    timings.clear()
+    start = time.perf_counter()
+    for module in get_warmup_modules():
+        run_step(f"import {module}", importlib.import_module, module)
+    run_step("position keys", warm_position_keys)
+    run_step("url resolver", warm_url_resolver)
+    run_step("serializers", warm_serializers)
+    run_step("synthetic request", make_synthetic_request)
+    for alias in dict.fromkeys([DEFAULT_DB_ALIAS, *get_shards()]):
+        run_step(f"connect {alias}", connections[alias].ensure_connection)
+    # Every process opens its own connections on its first query
+    run_step("close connections", connections.close_all)
+
+    logger.info(
+        "Warmed up in %.0f ms: %s",
+        (time.perf_counter() - start) * 1000,
+        ", ".join(f"{step} {seconds * 1000:.0f} ms" for step, seconds, _ in timings),
+    )
+
+
+def run_step(step, function, *args):
+    start = time.perf_counter()
+    error = None
+    try:
+        function(*args)
+    except Exception as exc:
+        error = repr(exc)
+        logger.warning("Warmup step %r failed", step, exc_info=True)
+    timings.append((step, time.perf_counter() - start, error))
+
+
+def get_warmup_modules():
+    # The URL configuration, which imports the views, serializers and REST
+    # framework, is otherwise only imported on the first request
+    modules = [settings.ROOT_URLCONF]
+    if getattr(settings, "GAMES_COMPUTER_OPPONENT", None) == "mcts":
+        modules.append("games.mcts")
+    return modules
+
+
+def warm_position_keys():
+    """
+    Fills the canonical key cache for every board with as many player tokens
+    as computer tokens, or one more, which are all the boards reachable in a game.
+    """
+    import numpy as np
+
+    from games.boards import BOARD_KEYS, get_canonical_key
+    from games.evaluator import decode_boards
+
+    cells = decode_boards(np.arange(BOARD_KEYS))
+    difference = (cells == 1).sum(axis=1) - (cells == 2).sum(axis=1)
+    for key in np.flatnonzero((difference == 0) | (difference == 1)):
+        get_canonical_key(int(key))
+
+
+def warm_url_resolver():
+    # Resolving compiles the patterns, reversing builds the reverse lookup tables
+    resolver = get_resolver()
+    resolver.resolve(reverse("games-list"))
+    reverse("games-detail", kwargs={"pk": 1})
+
+
+def warm_serializers():
+    from games import serializers
+
+    for serializer_class in (
+        serializers.CreateGameSerializer,
+        serializers.RetrieveGameSerializer,
+        serializers.MakeMoveSerializer,
+        serializers.MovesSinceSerializer,
+    ):
+        # Fields are built lazily on first access
+        serializer_class().fields
+
+
+def make_synthetic_request():
+    """
+    Sends a request to the API root through the whole middleware and REST
+    framework stack, without a network round trip.
+    """
+    from django.test import Client
+
+    host = next(
+        (host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"),
+        "localhost",
+    )
+    response = Client(HTTP_HOST=host, HTTP_ACCEPT="application/json").get(
+        reverse("api-root")
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"Synthetic request returned {response.status_code}")
+
+
+def summarize_import_times(lines):
+    """
+    Returns the import time in seconds of every top-level package, from the
+    output of python -X importtime, sorted from slowest to fastest. A package's
+    time is the time spent in its own modules, excluding the other packages
+    they import.
+    """
+    packages = defaultdict(float)
+    for line in lines:
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            packages[match.group(2).split(".")[0]] += int(match.group(1)) / 1e6
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)
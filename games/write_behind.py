@@ -0,0 +1,259 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+
+from games.exceptions import MoveOutOfOrder
+from games.models import Move
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WRITE_BEHIND = {
+    # Moves are written to the database in the background when enabled
+    "ENABLED": False,
+    # Seconds between background flushes, the most moves that can be lost in a crash
+    "FLUSH_INTERVAL": 1.0,
+    # Pending moves that make the next move flush synchronously
+    "MAX_PENDING": 1000,
+    # Boards of in-flight games kept in memory
+    "MAX_GAMES": 10000,
+}
+
+# Keeps the inserts under SQLite's limit of 999 query parameters
+INSERT_BATCH_SIZE = 100
+
+
+def get_options():
+    return {**DEFAULT_WRITE_BEHIND, **getattr(settings, "GAMES_WRITE_BEHIND", {})}
+
+
+def is_enabled():
+    return get_options()["ENABLED"]
+
+
+def reset(moves):
+    # bulk_create sets the ids even when its transaction is rolled back
+    for move in moves:
+        move.pk = None
+        move._state.adding = True
+
+
+class WriteBehindStore:
+    """
+    In-process store for the moves of in-flight games. Moves are acknowledged
+    as soon as they're added, and written to the database in batches by a
+    background thread every FLUSH_INTERVAL seconds, as well as when the process
+    exits. The board of every game with recent moves is kept in memory, so the
+    game can be played and read without waiting for the writes.
+
+    The store only knows about the moves made by its own process. With several
+    worker processes, requests for a game must always reach the same process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Only one flush runs at a time, so moves are written in order
+        self._flush_lock = threading.Lock()
+        # Pending (database, move) pairs by game, in the order they were added
+        self._pending = OrderedDict()
+        self._pending_count = 0
+        self._boards = OrderedDict()
+        self._thread = None
+        self._pid = None
+
+    def add(self, move, using):
+        """
+        Queues an unsaved move to be written to the given database, and keeps
+        its board as the current board of the game. Raises MoveOutOfOrder if
+        the game's current board isn't the one right before the move.
+        """
+        options = get_options()
+        with self._lock:
+            self._check_ply(move.game_id, move.ply)
+            self._pending.setdefault(move.game_id, []).append((using, move))
+            self._pending_count += 1
+            self._set_board(
+                move.game_id, move.ply, move.board_state, options["MAX_GAMES"]
+            )
+            pending = self._pending_count
+
+        if pending >= options["MAX_PENDING"]:
+            # Applies back pressure instead of letting the queue grow unbounded.
+            # Waits for the caller's transaction, so a rollback can't undo the
+            # writes of moves that were already taken off the queue.
+            transaction.on_commit(self.flush, using=using)
+        else:
+            self._start(options["FLUSH_INTERVAL"])
+
+    def check_ply(self, game_id, ply):
+        """
+        Raises MoveOutOfOrder if the game's current board in the store isn't
+        the one right before the given ply, e.g. when another request moved
+        first. Games without a board in the store aren't checked.
+        """
+        with self._lock:
+            self._check_ply(game_id, ply)
+
+    def _check_ply(self, game_id, ply):
+        current = self._boards.get(game_id)
+        if current is not None and current[0] != ply - 1:
+            raise MoveOutOfOrder(
+                f"Move {ply} of game {game_id} doesn't follow move {current[0]}"
+            )
+
+    def get_board(self, game_id):
+        """
+        Returns the current board of the game if it has recent moves, or None.
+        """
+        with self._lock:
+            current = self._boards.get(game_id)
+            if current is None:
+                return None
+            self._boards.move_to_end(game_id)
+            return current[1]
+
+    def forget(self, game_id):
+        with self._lock:
+            self._boards.pop(game_id, None)
+
+    def has_pending(self, game_id):
+        with self._lock:
+            return game_id in self._pending
+
+    def flush_game(self, game_id):
+        """
+        Writes the pending moves of the game, so its history can be read from
+        the database. The moves of other games stay pending. Returns how many
+        moves were written.
+        """
+        if not self.has_pending(game_id):
+            return 0
+        # Waits for a running flush, which may be writing earlier moves of the game
+        with self._flush_lock:
+            with self._lock:
+                pending = self._pending.pop(game_id, [])
+                self._pending_count -= len(pending)
+            return self._write_pending(pending)
+
+    def flush(self):
+        """
+        Writes every pending move and returns how many were written. Moves that
+        violate a constraint are logged and dropped, e.g. if their game was
+        deleted. On any other error the moves are queued again.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending = [item for items in self._pending.values() for item in items]
+                self._pending = OrderedDict()
+                self._pending_count = 0
+            return self._write_pending(pending)
+
+    def _write_pending(self, pending):
+        if not pending:
+            return 0
+
+        moves_by_database = defaultdict(list)
+        for using, move in pending:
+            moves_by_database[using].append(move)
+
+        written = 0
+        done = set()
+        try:
+            for using, moves in moves_by_database.items():
+                written += self._write(using, moves)
+                done.add(using)
+        except Exception:
+            self._requeue(
+                [(using, move) for using, move in pending if using not in done]
+            )
+            raise
+        return written
+
+    def _write(self, using, moves):
+        try:
+            with transaction.atomic(using=using):
+                Move.objects.using(using).bulk_create(
+                    moves, batch_size=INSERT_BATCH_SIZE
+                )
+            return len(moves)
+        except IntegrityError:
+            logger.warning(
+                "Could not write a batch of %d moves, writing them one by one",
+                len(moves),
+                exc_info=True,
+            )
+            reset(moves)
+
+        written = 0
+        for move in moves:
+            try:
+                with transaction.atomic(using=using):
+                    move.save(using=using, force_insert=True)
+                written += 1
+            except IntegrityError:
+                logger.error(
+                    "Dropped move %s of game %s", move.ply, move.game_id, exc_info=True
+                )
+        return written
+
+    def _requeue(self, pending):
+        reset([move for _, move in pending])
+        with self._lock:
+            # Ahead of the moves added since they were taken
+            requeued = OrderedDict()
+            for using, move in pending:
+                requeued.setdefault(move.game_id, []).append((using, move))
+            for game_id, items in self._pending.items():
+                requeued.setdefault(game_id, []).extend(items)
+            self._pending = requeued
+            self._pending_count += len(pending)
+
+    def clear(self):
+        """
+        Forgets every pending move and board, without writing them.
+        """
+        with self._lock:
+            self._pending = OrderedDict()
+            self._pending_count = 0
+            self._boards.clear()
+
+    def _set_board(self, game_id, ply, board, max_games):
+        self._boards[game_id] = (ply, board)
+        self._boards.move_to_end(game_id)
+        while len(self._boards) > max_games:
+            # Least recently used first. Games with pending moves that lose their
+            # board are flushed before being read again (see GameLogicService).
+            self._boards.popitem(last=False)
+
+    def _start(self, interval):
+        # Forked workers don't inherit the thread, they start their own
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, args=(interval,), name="write-behind", daemon=True
+            )
+            self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Write-behind flush failed, retrying later")
+            finally:
+                # Connections of this thread, opened by the flush
+                connections.close_all()
+
+
+store = WriteBehindStore()
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -82,6 +84,37 @@ DATABASES = {
     }
 }
 
+# Games and moves can be sharded across several SQLite files by the id of the
+# user who owns them, so writes aren't serialized on a single database lock.
+# Users, sessions and the rest of the tables stay on the default database.
+# After changing the number of shards, run `python manage.py migrate_shards`
+# and `python manage.py rebalance_shards`.
+GAMES_SHARD_COUNT = int(os.environ.get("GAMES_SHARD_COUNT", 0))
+
+GAMES_SHARDS = [f"games_shard_{i}" for i in range(GAMES_SHARD_COUNT)]
+
+# Shards retired by lowering GAMES_SHARD_COUNT, e.g. "games_shard_2,games_shard_3".
+# They stay declared until rebalance_shards --from-db has moved their games out.
+GAMES_RETIRED_SHARDS = [
+    shard for shard in os.environ.get("GAMES_RETIRED_SHARDS", "").split(",") if shard
+]
+
+GAMES_SHARD_DATABASES = [*GAMES_SHARDS, *GAMES_RETIRED_SHARDS]
+
+if sys.argv[1:2] == ["test"]:
+    # The sharding tests run against two shards, with in-memory test databases
+    GAMES_SHARD_DATABASES = list(
+        dict.fromkeys([*GAMES_SHARD_DATABASES, "games_shard_0", "games_shard_1"])
+    )
+
+for shard in GAMES_SHARD_DATABASES:
+    DATABASES[shard] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / f"{shard}.sqlite3",
+    }
+
+DATABASE_ROUTERS = ["games.routers.GameShardRouter"]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
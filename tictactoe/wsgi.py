@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tictactoe.settings')
 
 application = get_wsgi_application()
+
+# Pays the cold start costs before the worker accepts traffic
+from games.warmup import warm_up  # noqa: E402
+
+warm_up()